@@ -1,18 +1,141 @@
 """
 Command-line interface for duck-console
 """
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import duckdb
 import typer
+from duck_console.core.duck_engine import DuckEngine, EngineConfig
+from duck_console.core.jobs import (
+    JobQueue,
+    cancel_job,
+    enqueue_job,
+    load_jobs,
+    read_job,
+)
+from duck_console.utils.io_helpers import sanitize_table_name
 from duck_console.web import main as web_main
 
 app = typer.Typer()
 
+
 @app.command()
-def web():
+def web(
+    memory_limit: Optional[str] = typer.Option(
+        None, help="Maximum memory DuckDB may use, e.g. 4GB"
+    ),
+    threads: Optional[int] = typer.Option(
+        None, help="Number of DuckDB worker threads"
+    ),
+    temp_directory: Optional[str] = typer.Option(
+        None, help="Directory where DuckDB spills to disk"
+    ),
+    max_temp_directory_size: Optional[str] = typer.Option(
+        None, help="Maximum size of the spill directory, e.g. 20GB"
+    ),
+    metrics_port: Optional[int] = typer.Option(
+        None, help="Serve Prometheus metrics on this port"
+    ),
+    plugin_directory: Optional[str] = typer.Option(
+        None, help="Directory of Python UDF plugins to load"
+    ),
+):
     """Start the web console interface"""
+    settings = {
+        "memory_limit": memory_limit,
+        "threads": threads,
+        "temp_directory": temp_directory,
+        "max_temp_directory_size": max_temp_directory_size,
+        "metrics_port": metrics_port,
+        "plugin_directory": plugin_directory,
+    }
+    for name, value in settings.items():
+        if value is not None:
+            os.environ[f"DUCK_CONSOLE_{name.upper()}"] = str(value)
     web_main()
 
+
+@app.command("import")
+def import_file(
+    file_path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    table: Optional[str] = typer.Option(
+        None, help="Table name (defaults to the file name)"
+    ),
+    database: str = typer.Option(
+        "data/database.duckdb", help="DuckDB database file"
+    ),
+    jobs_dir: str = typer.Option(
+        "data/jobs", help="Job state directory shared with the web console"
+    ),
+    handoff_timeout: float = typer.Option(
+        30.0, help="Seconds to wait for the web console to pick up the import"
+    ),
+):
+    """Import a CSV file through the ingestion queue
+
+    If the web console holds the database, the job is handed to its queue
+    and this command waits for it to finish. The command fails if the
+    database is locked and no queue picks the job up within
+    ``handoff_timeout`` seconds (e.g. a notebook holds the file).
+    """
+    table_name = table or sanitize_table_name(file_path.name)
+    os.makedirs(Path(database).parent, exist_ok=True)
+    try:
+        engine = DuckEngine(database, config=EngineConfig.from_env())
+    except duckdb.IOException:
+        engine = queue = None
+        job = enqueue_job(jobs_dir, file_path, table_name)
+        typer.echo("Database in use, import sent to the web console queue", err=True)
+    else:
+        queue = JobQueue(engine, jobs_dir, max_workers=1, adopt=False)
+        job = queue.submit(file_path, table_name)
+
+    deadline = time.monotonic() + handoff_timeout
+    while job.status in ("queued", "running"):
+        time.sleep(0.5)
+        job = read_job(jobs_dir, job.id)
+        if (
+            queue is None
+            and job.owner_pid is None
+            and time.monotonic() > deadline
+            and cancel_job(jobs_dir, job.id)
+        ):
+            typer.echo(
+                f"Database '{database}' is locked by another process and no "
+                "web console picked up the import",
+                err=True
+            )
+            raise typer.Exit(code=1)
+        typer.echo(f"{job.status}: {job.rows_done:,} rows", err=True)
+
+    if queue is not None:
+        queue.shutdown()
+        engine.close()
+    if job.status == "failed":
+        typer.echo(f"Import failed: {job.error}", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"Table '{job.table_name}' loaded with {job.rows_done:,} rows")
+
+
+@app.command()
+def jobs(
+    jobs_dir: str = typer.Option(
+        "data/jobs", help="Job state directory shared with the web console"
+    ),
+):
+    """List import jobs and their status"""
+    for job in load_jobs(jobs_dir):
+        typer.echo(
+            f"{job.id[:8]}  {job.status:<9}  {job.table_name:<20}  "
+            f"{job.rows_done:>12,} rows  {job.error or ''}"
+        )
+
+
 @app.command()
 def shell():
     """Start an interactive DuckDB shell"""
     # TODO: Implement interactive shell
-    typer.echo("Interactive shell not yet implemented")
\ No newline at end of file
+    typer.echo("Interactive shell not yet implemented")
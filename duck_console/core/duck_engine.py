@@ -1,44 +1,240 @@
 """
 DuckDB engine core functionality
 """
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Callable, Iterable, Iterator, Literal, Optional, Sequence, Union
 
 import duckdb
 import pandas as pd
 from pydantic import BaseModel
 
+from duck_console.core.partitions import PartitionSet
+from duck_console.core.udf import FunctionDefinition, discover_plugins, wrap_numpy
+from duck_console.utils.io_helpers import quote_identifier
+from duck_console.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CATALOG = "duck_console.summaries"
+
+
+class _FunctionHost:
+    """Connection owning the Python functions of a database instance
+
+    Shared by every engine open on the same database file (see
+    DuckEngine.register_function) and closed when the last one closes.
+    """
+
+    def __init__(self, conn: Optional[duckdb.DuckDBPyConnection] = None):
+        self.conn = conn
+        self.functions: dict[str, FunctionDefinition] = {}
+        self.users = 0
+
+
+# Function hosts of the database files open in this process, by resolved path
+_function_hosts: dict[str, _FunctionHost] = {}
+_function_hosts_lock = threading.Lock()
+
+
 class TableInfo(BaseModel):
     """Information about a table in DuckDB"""
     name: str
     columns: list[str]
     row_count: int
 
+
+class EngineConfig(BaseModel):
+    """Resource limits of a DuckDB database instance
+
+    The limits apply to the whole instance, i.e. to every connection and
+    engine opened on the same database file in this process, not to a
+    single connection. Unset fields keep DuckDB's defaults.
+    """
+    memory_limit: Optional[str] = None
+    threads: Optional[int] = None
+    temp_directory: Optional[str] = None
+    max_temp_directory_size: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, prefix: str = "DUCK_CONSOLE_") -> "EngineConfig":
+        """Build a config from environment variables
+
+        Each field is read from ``<prefix><FIELD NAME>``, e.g.
+        ``DUCK_CONSOLE_MEMORY_LIMIT``.
+
+        Args:
+            prefix: Environment variable prefix
+
+        Returns:
+            EngineConfig with the values found in the environment
+        """
+        values = {
+            field: os.environ[prefix + field.upper()]
+            for field in cls.model_fields
+            if os.environ.get(prefix + field.upper())
+        }
+        return cls(**values)
+
+    def to_duckdb(self) -> dict[str, Union[str, int]]:
+        """Get the settings accepted by duckdb.connect(config=...)
+
+        Returns:
+            Dictionary with the fields that are set
+        """
+        return self.model_dump(exclude_none=True)
+
+
+class SummaryDefinition(BaseModel):
+    """Definition of a summary (materialized) table
+
+    The query references its source table through the ``{source}``
+    placeholder, e.g. ``SELECT day, key, SUM(v) AS total FROM {source}
+    GROUP BY day, key``. When ``merge`` maps every measure column to
+    ``sum``, ``min`` or ``max``, appends to the source are folded into the
+    summary incrementally instead of recomputing it from scratch.
+    """
+    name: str
+    query: str
+    source: str
+    refresh: Literal["on_write", "manual"] = "on_write"
+    key_columns: list[str] = []
+    merge: dict[str, Literal["sum", "min", "max"]] = {}
+    stale: bool = False
+
+    @property
+    def incremental(self) -> bool:
+        """Whether appends can be merged without a full refresh"""
+        return bool(self.key_columns and self.merge)
+
+
+class StatementCacheInfo(BaseModel):
+    """Statistics of the prepared statement cache"""
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
 class DuckEngine:
     """Core DuckDB engine wrapper"""
     
-    def __init__(self, database_path: Optional[Union[str, Path]] = None):
+    def __init__(
+        self,
+        database_path: Optional[Union[str, Path]] = None,
+        config: Optional[EngineConfig] = None,
+        statement_cache_size: int = 256,
+        plugin_directory: Optional[Union[str, Path]] = None,
+    ):
         """Initialize DuckDB connection
         
         Args:
             database_path: Path to DuckDB database file. If None, use in-memory database.
+            config: Resource limits for the connection. If None, use DuckDB defaults.
+            statement_cache_size: Maximum number of parsed statements kept per
+                connection
+            plugin_directory: Directory of UDF plugin files to load at startup
         """
         self.database_path = database_path
-        self.conn = duckdb.connect(database=database_path)
+        config = config or EngineConfig()
+        self._conn = duckdb.connect(
+            database=str(database_path or ":memory:"),
+            config=config.to_duckdb()
+        )
+        self._owner_thread = threading.get_ident()
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
         self.tables: dict[str, TableInfo] = {}
+        self.partitions: dict[str, PartitionSet] = {}
+        self.statement_cache_size = statement_cache_size
+        self._statements: OrderedDict[str, duckdb.Statement] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._function_key: Optional[str] = None
+        if database_path is None or str(database_path) == ":memory:":
+            self._function_host = _FunctionHost(self._conn)
+        else:
+            self._function_key = str(Path(database_path).resolve())
+            with _function_hosts_lock:
+                self._function_host = _function_hosts.setdefault(
+                    self._function_key, _FunctionHost()
+                )
+                self._function_host.users += 1
+
+        try:
+            self._conn.execute("CREATE SCHEMA IF NOT EXISTS duck_console")
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {SUMMARY_CATALOG} (
+                    name VARCHAR PRIMARY KEY,
+                    definition VARCHAR NOT NULL
+                )
+            """)
+            if plugin_directory is not None:
+                self.load_plugins(plugin_directory)
+
+            # duckdb.connect ignores the config when the database file is
+            # already open in this process, so apply it explicitly.
+            settings = config.to_duckdb()
+            if settings:
+                self.configure(**settings)
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def conn(self) -> duckdb.DuckDBPyConnection:
+        """Connection for the calling thread
+
+        DuckDB connections must not be shared between threads, so threads
+        other than the one that created the engine get their own cursor on
+        the same database.
+        """
+        if threading.get_ident() == self._owner_thread:
+            return self._conn
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self._conn.cursor()
+        return cursor
 
-    def create_table_from_df(self, table_name: str, df: pd.DataFrame) -> TableInfo:
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run a block of writes atomically on the calling thread's connection
+
+        The writes are rolled back if the block raises, e.g.
+
+            with engine.transaction():
+                engine.create_table_from_csv("sales", path)
+        """
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            self.tables.clear()
+            raise
+        self.conn.execute("COMMIT")
+
+    def create_table_from_df(
+        self, table_name: str, df: pd.DataFrame, refresh: bool = True
+    ) -> TableInfo:
         """Create a table from a pandas DataFrame
         
         Args:
             table_name: Name for the new table
             df: Pandas DataFrame with the data
+            refresh: Refresh summaries over the table (see refresh_dependents)
             
         Returns:
             TableInfo with details about the created table
         """
-        self.conn.execute(f"DROP TABLE IF EXISTS {table_name}")
-        self.conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM df")
+        table = quote_identifier(table_name)
+        with metrics.span("phase", phase="load", source="dataframe"):
+            self.conn.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM df")
+        metrics.inc("rows_total", len(df), phase="load")
         
         info = TableInfo(
             name=table_name,
@@ -46,8 +242,447 @@ class DuckEngine:
             row_count=len(df)
         )
         self.tables[table_name] = info
+        if refresh:
+            self.refresh_dependents(table_name)
         return info
 
+    def create_table_from_csv(
+        self,
+        table_name: str,
+        file_path: Union[str, Path],
+        delimiter: Optional[str] = None,
+        header: Optional[bool] = None,
+        refresh: bool = True
+    ) -> TableInfo:
+        """Create a table by letting DuckDB read a CSV file directly
+
+        The file is parsed by DuckDB without building a DataFrame in
+        Python. Plain and gzip-compressed files are supported. An existing
+        table is only replaced once the whole file was read.
+
+        Args:
+            table_name: Name for the new table
+            file_path: Path to the CSV file
+            delimiter: Column delimiter (auto-detected if None)
+            header: Whether the file has a header row (auto-detected if None)
+            refresh: Refresh summaries over the table (see refresh_dependents)
+
+        Returns:
+            TableInfo with details about the created table
+        """
+        options = {"delim": delimiter, "header": header}
+        options = {name: value for name, value in options.items() if value is not None}
+        arguments = "".join(f", {name} = ?" for name in options)
+
+        table = quote_identifier(table_name)
+        with metrics.span("phase", phase="load", source="csv"):
+            self.conn.execute(
+                f"CREATE OR REPLACE TABLE {table} AS "
+                f"SELECT * FROM read_csv_auto(?{arguments})",
+                [str(file_path), *options.values()]
+            )
+
+        self.tables.pop(table_name, None)
+        info = self.get_table_info(table_name)
+        metrics.inc("rows_total", info.row_count, phase="load")
+        if Path(file_path).is_file():
+            metrics.inc("bytes_total", Path(file_path).stat().st_size, phase="load")
+        if refresh:
+            self.refresh_dependents(table_name)
+        return info
+
+    def append_df(
+        self, table_name: str, df: pd.DataFrame, refresh: bool = True
+    ) -> TableInfo:
+        """Append rows from a pandas DataFrame to a table
+
+        The table is created if it does not exist yet. Columns are matched
+        by name, so their order in the DataFrame does not matter. Summaries
+        defined over the table are updated incrementally where possible.
+
+        Args:
+            table_name: Name of the target table
+            df: Pandas DataFrame with the rows to append
+            refresh: Update summaries over the table. Pass False when
+                appending several chunks and call refresh_dependents once
+                at the end instead.
+
+        Returns:
+            TableInfo with details about the updated table
+        """
+        if table_name not in self.get_table_names():
+            return self.create_table_from_df(table_name, df, refresh=refresh)
+
+        table = quote_identifier(table_name)
+        with metrics.span("phase", phase="load", source="dataframe"):
+            self.conn.execute(f"INSERT INTO {table} BY NAME SELECT * FROM df")
+        metrics.inc("rows_total", len(df), phase="load")
+        self.tables.pop(table_name, None)
+        info = self.get_table_info(table_name)
+        if refresh:
+            self.refresh_dependents(table_name, delta=df)
+        return info
+
+    @property
+    def summaries(self) -> dict[str, SummaryDefinition]:
+        """Summary definitions stored in the database
+
+        Definitions live in the ``duck_console.summaries`` catalog table,
+        so they survive restarts and are shared by every engine opened on
+        the same database file.
+        """
+        rows = self.conn.execute(
+            f"SELECT name, definition FROM {SUMMARY_CATALOG} ORDER BY name"
+        ).fetchall()
+        return {
+            name: SummaryDefinition.model_validate_json(definition)
+            for name, definition in rows
+        }
+
+    def create_summary(
+        self,
+        name: str,
+        query: str,
+        source: str,
+        refresh: str = "on_write",
+        key_columns: Optional[list[str]] = None,
+        merge: Optional[dict[str, str]] = None,
+    ) -> SummaryDefinition:
+        """Declare a summary table and build it from its source
+
+        Only writes made through the engine's load methods
+        (``create_table_from_df``, ``create_table_from_csv``, ``append_df``)
+        refresh summaries. After changing the source with ``execute``,
+        ``executemany`` or the SQL editor, call ``refresh_summary``.
+
+        Args:
+            name: Name of the summary table
+            query: SQL definition using ``{source}`` for the source table
+            source: Name of the source table
+            refresh: ``on_write`` to refresh after every load into the
+                source, ``manual`` to only mark it stale
+            key_columns: Grouping columns of the summary
+            merge: Mapping of measure column to ``sum``, ``min`` or ``max``
+                used to merge appended rows incrementally
+
+        Returns:
+            The registered SummaryDefinition
+
+        Raises:
+            KeyError: If the source table does not exist
+            ValueError: If key_columns and merge do not match the columns
+                of the summary
+        """
+        if source not in self.get_table_names():
+            raise KeyError(f"Table '{source}' not found")
+
+        summary = SummaryDefinition(
+            name=name,
+            query=query,
+            source=source,
+            refresh=refresh,
+            key_columns=key_columns or [],
+            merge=merge or {},
+        )
+        self._build_summary(summary)
+        self._save_summary(summary)
+        return summary
+
+    def refresh_summary(self, name: str) -> TableInfo:
+        """Fully rebuild a summary table from its source
+
+        Args:
+            name: Name of the summary table
+
+        Returns:
+            TableInfo with details about the rebuilt summary
+
+        Raises:
+            KeyError: If no summary with that name is defined
+        """
+        summaries = self.summaries
+        if name not in summaries:
+            raise KeyError(f"Summary '{name}' not found")
+
+        summary = summaries[name]
+        self._build_summary(summary)
+        if summary.stale:
+            summary.stale = False
+            self._save_summary(summary)
+        return self.get_table_info(name)
+
+    def drop_summary(self, name: str) -> None:
+        """Remove a summary definition and its table
+
+        Args:
+            name: Name of the summary table
+        """
+        self.conn.execute(f"DELETE FROM {SUMMARY_CATALOG} WHERE name = ?", [name])
+        self.tables.pop(name, None)
+        self.conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(name)}")
+
+    def _save_summary(self, summary: SummaryDefinition) -> None:
+        """Store a summary definition in the catalog table"""
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {SUMMARY_CATALOG} VALUES (?, ?)",
+            [summary.name, summary.model_dump_json()]
+        )
+
+    @staticmethod
+    def _summary_sql(summary: SummaryDefinition, source: str) -> str:
+        """Substitute the source relation into a summary query
+
+        ``str.replace`` is used instead of ``str.format`` so that braces
+        elsewhere in the SQL (e.g. struct literals) are left alone.
+        """
+        return summary.query.replace("{source}", source)
+
+    def _build_summary(self, summary: SummaryDefinition) -> None:
+        """Validate a summary against its query and (re)create its table
+
+        Raises:
+            ValueError: If key_columns and merge do not match the columns
+                of the summary
+        """
+        query = self._summary_sql(summary, quote_identifier(summary.source))
+        columns = list(self.conn.execute(f"DESCRIBE {query}").fetchdf()['column_name'])
+
+        declared = set(summary.key_columns) | set(summary.merge)
+        unknown = declared - set(columns)
+        if unknown:
+            raise ValueError(
+                f"Summary '{summary.name}' has no columns: {', '.join(sorted(unknown))}"
+            )
+        overlap = set(summary.key_columns) & set(summary.merge)
+        if overlap:
+            raise ValueError(
+                f"Summary '{summary.name}' key columns cannot be merged: "
+                f"{', '.join(sorted(overlap))}"
+            )
+        if summary.incremental and declared != set(columns):
+            missing = [col for col in columns if col not in declared]
+            raise ValueError(
+                f"Summary '{summary.name}' needs a key or merge rule for: "
+                f"{', '.join(missing)}"
+            )
+
+        table = quote_identifier(summary.name)
+        self.conn.execute(f"CREATE OR REPLACE TABLE {table} AS {query}")
+        self.tables.pop(summary.name, None)
+
+    def refresh_dependents(
+        self, table_name: str, delta: Optional[pd.DataFrame] = None
+    ) -> None:
+        """Refresh summaries whose source is table_name
+
+        Called automatically by the load methods; call it directly after
+        writes made with ``refresh=False``, outside of ``transaction()``
+        since a failed statement aborts the open transaction. A summary that fails to
+        refresh (e.g. because the source lost a column it uses) is logged
+        and marked stale instead of failing the write.
+
+        Args:
+            table_name: Table that was just written
+            delta: Appended rows, or None if the table was replaced
+        """
+        for summary in self.summaries.values():
+            if summary.source != table_name:
+                continue
+            if summary.refresh == "manual":
+                if not summary.stale:
+                    summary.stale = True
+                    self._save_summary(summary)
+                continue
+            try:
+                if delta is not None and summary.incremental:
+                    self._merge_summary(summary, delta)
+                else:
+                    self._build_summary(summary)
+            except (duckdb.Error, ValueError):
+                logger.exception("Failed to refresh summary '%s'", summary.name)
+                summary.stale = True
+                self._save_summary(summary)
+            else:
+                if summary.stale:
+                    summary.stale = False
+                    self._save_summary(summary)
+
+    def _merge_summary(self, summary: SummaryDefinition, delta: pd.DataFrame) -> None:
+        """Fold appended source rows into an existing summary
+
+        The existing rows and the partial summary of the delta are
+        re-aggregated in a single statement, so a failure leaves the
+        summary unchanged.
+
+        Args:
+            summary: Summary definition to update
+            delta: Rows appended to the source table
+        """
+        self.conn.register("_summary_delta", delta)
+        try:
+            partial = self._summary_sql(summary, "_summary_delta")
+            table = quote_identifier(summary.name)
+            columns = []
+            for col in self.get_table_schema(summary.name)['column_name']:
+                column = quote_identifier(col)
+                if col in summary.merge:
+                    aggregate = summary.merge[col].upper()
+                    column = f"{aggregate}({column}) AS {column}"
+                columns.append(column)
+            keys = [quote_identifier(col) for col in summary.key_columns]
+            self.conn.execute(f"""
+                CREATE OR REPLACE TABLE {table} AS
+                SELECT {", ".join(columns)}
+                FROM (SELECT * FROM {table} UNION ALL BY NAME ({partial}))
+                GROUP BY {", ".join(keys)}
+            """)
+        finally:
+            self.conn.unregister("_summary_delta")
+        self.tables.pop(summary.name, None)
+
+    def add_partitioned_table(
+        self,
+        name: str,
+        directory: Union[str, Path],
+        max_workers: Optional[int] = None
+    ) -> PartitionSet:
+        """Register a logical table partitioned across DuckDB files
+
+        Args:
+            name: Name of the logical table
+            directory: Directory holding one database file per partition
+            max_workers: Maximum parallel workers for ingestion and queries
+
+        Returns:
+            PartitionSet managing the partition files
+        """
+        partition_set = PartitionSet(name, directory, max_workers=max_workers)
+        self.partitions[name] = partition_set
+        return partition_set
+
+    def query_partitioned(
+        self,
+        name: str,
+        query: str,
+        merge_query: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Fan a query out across the partitions of a logical table
+
+        Args:
+            name: Name of the logical table
+            query: SQL query run against each partition
+            merge_query: Optional SQL over ``partials`` combining the results
+
+        Returns:
+            Pandas DataFrame with the combined results
+
+        Raises:
+            KeyError: If no partitioned table with that name is registered
+        """
+        if name not in self.partitions:
+            raise KeyError(f"Partitioned table '{name}' not found")
+        return self.partitions[name].query(query, merge_query)
+
+    def register_function(
+        self,
+        name: str,
+        fn: Callable,
+        arg_types: list[str],
+        return_type: str,
+        vectorized: bool = True,
+        batch_format: str = "arrow"
+    ) -> FunctionDefinition:
+        """Register a Python function as a DuckDB scalar function
+
+        Vectorized functions are called once per batch of rows, receiving
+        one pyarrow array per argument (or numpy arrays with
+        ``batch_format="numpy"``) and returning an array of results.
+        Non-vectorized functions are called once per row with Python values.
+
+        Functions live in the database catalog, so they are shared by every
+        engine open on the same database file. Registering a name again
+        replaces the function for all of them, unless the definition is
+        unchanged (e.g. each engine loading the same plugins).
+
+        Args:
+            name: SQL function name
+            fn: Python function implementing it
+            arg_types: DuckDB type name of each argument, e.g. ["VARCHAR"]
+            return_type: DuckDB type name of the result
+            vectorized: Call the function per batch instead of per row
+            batch_format: ``arrow`` or ``numpy`` for vectorized functions
+
+        Returns:
+            The registered FunctionDefinition
+
+        Raises:
+            ImportError: If a vectorized function is registered without pyarrow
+        """
+        definition = FunctionDefinition(
+            name=name,
+            function=fn,
+            arg_types=arg_types,
+            return_type=return_type,
+            vectorized=vectorized,
+            batch_format=batch_format
+        )
+        function = fn
+        if vectorized and batch_format == "numpy":
+            function = wrap_numpy(fn)
+
+        host = self._function_host
+        with _function_hosts_lock:
+            if host.functions.get(name) == definition:
+                return definition
+            # Functions call back into the connection that created them, so
+            # on database files they are created on a connection shared by
+            # all engines on the file rather than on this engine's own one,
+            # which may be closed while other engines still use them.
+            if host.conn is None:
+                host.conn = duckdb.connect(self._function_key)
+            if name in host.functions:
+                host.conn.remove_function(name)
+            host.conn.create_function(
+                name,
+                function,
+                [duckdb.sqltype(arg_type) for arg_type in arg_types],
+                duckdb.sqltype(return_type),
+                type="arrow" if vectorized else "native"
+            )
+            host.functions[name] = definition
+        return definition
+
+    @property
+    def functions(self) -> dict[str, FunctionDefinition]:
+        """Python functions registered on the database, by SQL name"""
+        with _function_hosts_lock:
+            return dict(self._function_host.functions)
+
+    def load_plugins(self, directory: Union[str, Path]) -> list[str]:
+        """Register every UDF defined in a plugin directory
+
+        Plugin files are Python modules whose functions are marked with
+        the ``duck_console.core.udf.udf`` decorator.
+
+        Args:
+            directory: Directory with plugin modules
+
+        Returns:
+            Names of the registered functions
+        """
+        names = []
+        for definition in discover_plugins(directory):
+            self.register_function(
+                definition.name,
+                definition.function,
+                definition.arg_types,
+                definition.return_type,
+                vectorized=definition.vectorized,
+                batch_format=definition.batch_format
+            )
+            names.append(definition.name)
+        return names
+
     def execute_query(self, query: str) -> pd.DataFrame:
         """Execute a SQL query and return results as DataFrame
         
@@ -57,7 +692,109 @@ class DuckEngine:
         Returns:
             Pandas DataFrame with query results
         """
-        return self.conn.execute(query).fetchdf()
+        return self.execute(query)
+
+    def execute(
+        self,
+        query: str,
+        params: Optional[Union[Sequence[Any], dict[str, Any]]] = None
+    ) -> pd.DataFrame:
+        """Execute a parameterized SQL query and return results as DataFrame
+
+        Values are bound to ``?``, ``$1`` or ``$name`` placeholders by
+        DuckDB, never formatted into the SQL text. Parsed statements are
+        cached per connection, keyed on the query text.
+
+        Args:
+            query: SQL query string with placeholders
+            params: Positional (sequence) or named (dict) parameter values
+
+        Returns:
+            Pandas DataFrame with query results (empty if the statement
+            returns no rows)
+        """
+        statement = self._prepare(query)
+        with metrics.span("phase", phase="query"):
+            try:
+                result = self.conn.execute(statement, params)
+                df = pd.DataFrame() if result.description is None else result.fetchdf()
+            except Exception:
+                metrics.inc("query_errors_total")
+                raise
+        metrics.inc("queries_total")
+        metrics.inc("rows_total", len(df), phase="query")
+        return df
+
+    def executemany(
+        self,
+        query: str,
+        rows: Iterable[Union[Sequence[Any], dict[str, Any]]]
+    ) -> int:
+        """Execute a parameterized statement once per parameter set
+
+        Meant for bulk row inserts, e.g.
+        ``executemany("INSERT INTO t VALUES (?, ?)", [(1, "a"), (2, "b")])``.
+
+        Args:
+            query: SQL statement with placeholders
+            rows: Parameter values for each execution
+
+        Returns:
+            Number of parameter sets executed
+        """
+        rows = list(rows)
+        if rows:
+            statement = self._prepare(query)
+            with metrics.span("phase", phase="load", source="executemany"):
+                self.conn.executemany(statement, rows)
+            metrics.inc("rows_total", len(rows), phase="load")
+        self.tables.clear()
+        return len(rows)
+
+    def statement_cache_info(self) -> StatementCacheInfo:
+        """Get statistics of the prepared statement cache
+
+        Returns:
+            StatementCacheInfo with hits, misses and current size
+        """
+        return StatementCacheInfo(
+            hits=self._cache_hits,
+            misses=self._cache_misses,
+            size=len(self._statements),
+            max_size=self.statement_cache_size
+        )
+
+    def _prepare(self, query: str) -> Union[duckdb.Statement, str]:
+        """Get the parsed statement for a query from the cache
+
+        Scripts with several statements are returned unparsed and run as
+        a whole.
+
+        Args:
+            query: SQL query string
+
+        Returns:
+            Cached duckdb.Statement, or the query text for multi-statement scripts
+        """
+        with self._cache_lock:
+            statement = self._statements.get(query)
+            if statement is not None:
+                self._statements.move_to_end(query)
+                self._cache_hits += 1
+                metrics.inc("statement_cache_hits_total")
+                return statement
+            self._cache_misses += 1
+        metrics.inc("statement_cache_misses_total")
+
+        statements = self.conn.extract_statements(query)
+        if len(statements) != 1:
+            return query
+
+        with self._cache_lock:
+            self._statements[query] = statements[0]
+            if len(self._statements) > self.statement_cache_size:
+                self._statements.popitem(last=False)
+        return statements[0]
 
     def get_table_names(self) -> list[str]:
         """Get list of all tables in the database
@@ -81,7 +818,7 @@ class DuckEngine:
         Returns:
             DataFrame with column name, type and other schema info
         """
-        return self.conn.execute(f"DESCRIBE {table_name}").fetchdf()
+        return self.conn.execute(f"DESCRIBE {quote_identifier(table_name)}").fetchdf()
 
     def get_table_info(self, table_name: str) -> TableInfo:
         """Get information about a table
@@ -94,7 +831,9 @@ class DuckEngine:
         """
         if table_name not in self.tables:
             schema = self.get_table_schema(table_name)
-            count = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+            count = self.conn.execute(
+                f"SELECT COUNT(*) FROM {quote_identifier(table_name)}"
+            ).fetchone()[0]
             self.tables[table_name] = TableInfo(
                 name=table_name,
                 columns=list(schema['column_name']),
@@ -102,6 +841,86 @@ class DuckEngine:
             )
         return self.tables[table_name]
 
+    @property
+    def config(self) -> EngineConfig:
+        """Resource limits currently in effect for the database instance
+
+        Read back from DuckDB, so the values reflect changes made through
+        any engine sharing the instance (e.g. memory_limit as ``"1.8 GiB"``).
+        """
+        return EngineConfig(**{
+            name: value or None for name, value in self.get_settings().items()
+        })
+
+    def configure(self, **settings: Union[str, int, None]) -> EngineConfig:
+        """Change resource limits of the database instance
+
+        The new limits apply to every engine and connection sharing the
+        database instance, e.g. all web sessions and the import queue.
+
+        Args:
+            **settings: EngineConfig fields to change, e.g. memory_limit="2GB"
+
+        Returns:
+            The EngineConfig in effect after the change
+
+        Raises:
+            ValueError: If a setting is not an EngineConfig field
+        """
+        unknown = set(settings) - set(EngineConfig.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown engine settings: {', '.join(sorted(unknown))}")
+
+        for name, value in settings.items():
+            if value is None:
+                self.conn.execute(f"RESET {name}")
+            else:
+                value = str(value).replace("'", "''")
+                self.conn.execute(f"SET {name} = '{value}'")
+        return self.config
+
+    def get_settings(self) -> dict[str, str]:
+        """Get the effective resource settings of the database instance
+
+        Returns:
+            Dictionary with the current value of each EngineConfig setting
+        """
+        query = "SELECT current_setting(?)"
+        return {
+            name: str(self.conn.execute(query, [name]).fetchone()[0])
+            for name in EngineConfig.model_fields
+        }
+
+    def get_memory_usage(self) -> dict[str, int]:
+        """Get memory and spill usage reported by DuckDB
+
+        Returns:
+            Dictionary with ``memory_bytes`` and ``temp_bytes`` in use
+        """
+        memory, temp = self.conn.execute("""
+            SELECT SUM(memory_usage_bytes), SUM(temporary_storage_bytes)
+            FROM duckdb_memory()
+        """).fetchone()
+        return {"memory_bytes": int(memory or 0), "temp_bytes": int(temp or 0)}
+
     def close(self):
-        """Close the database connection"""
-        self.conn.close()
\ No newline at end of file
+        """Close the database connection and partition worker pools
+
+        The connection owning the database's Python functions is closed
+        with the last engine open on the same file, releasing the file.
+        """
+        for partition_set in self.partitions.values():
+            partition_set.close()
+        self._conn.close()
+
+        host_conn = None
+        with _function_hosts_lock:
+            if self._function_key is not None:
+                host = _function_hosts[self._function_key]
+                host.users -= 1
+                if host.users == 0:
+                    del _function_hosts[self._function_key]
+                    host_conn = host.conn
+                self._function_key = None
+        if host_conn is not None:
+            host_conn.close()
\ No newline at end of file
@@ -1,10 +1,58 @@
 """
 File reading utilities for various formats
 """
+import codecs
+import csv
+import gzip
+import hashlib
+import io
+import shutil
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Union
+from typing import BinaryIO, Optional, Union
 
 import pandas as pd
+from pydantic import BaseModel
+
+from duck_console.utils.io_helpers import COMPRESSED_SUFFIXES
+from duck_console.utils.metrics import metrics
+
+try:
+    import zstandard
+except ImportError:  # zstandard is an optional dependency
+    zstandard = None
+
+try:
+    import chardet
+except ImportError:  # chardet is an optional dependency
+    chardet = None
+
+SAMPLE_SIZE = 64 * 1024
+# Compressed files cannot be sought cheaply, so their head, middle and tail
+# blocks are taken from this many decompressed bytes
+COMPRESSED_SCAN_SIZE = 16 * 1024 * 1024
+TRANSCODE_CHUNK_SIZE = 1024 * 1024
+UTF8_ENCODINGS = ("utf-8", "utf-8-sig")
+# Reported when every sampled byte is ASCII, which does not prove UTF-8
+ASCII_ENCODING = "ascii"
+# Tried in order when chardet is unavailable or unsure; latin-1 decodes anything
+FALLBACK_ENCODINGS = ("cp1252", "latin-1")
+MIN_CHARDET_CONFIDENCE = 0.5
+
+_dialect_cache: OrderedDict[tuple, "FileDialect"] = OrderedDict()
+_dialect_cache_lock = threading.Lock()
+_DIALECT_CACHE_SIZE = 256
+
+
+class FileDialect(BaseModel):
+    """Format of a text file detected from a sample of its contents"""
+    encoding: str
+    delimiter: Optional[str] = None
+    line_terminator: str = "\n"
+    record_length: Optional[int] = None
 
 
 def read_csv(
@@ -12,6 +60,10 @@ def read_csv(
     **kwargs
 ) -> pd.DataFrame:
     """Read a CSV file with smart defaults
+
+    Local files are sniffed for their delimiter and encoding unless the
+    caller passes ``delimiter`` or ``compression``; URLs, file objects and
+    those calls go to pd.read_csv unchanged.
     
     Args:
         file_path: Path to CSV file
@@ -20,7 +72,25 @@ def read_csv(
     Returns:
         Pandas DataFrame with the CSV contents
     """
-    return pd.read_csv(file_path, **kwargs)
+    local = isinstance(file_path, (str, Path)) and Path(file_path).is_file()
+    source = None
+    if local and "delimiter" not in kwargs and "compression" not in kwargs:
+        dialect = sniff_file(file_path)
+        if dialect.delimiter is not None:
+            kwargs.setdefault("sep", dialect.delimiter)
+        if "encoding" not in kwargs:
+            source = open_utf8(file_path, dialect.encoding)
+
+    with metrics.span("phase", phase="parse", format="csv"):
+        if source is None:
+            df = pd.read_csv(file_path, **kwargs)
+        else:
+            with source:
+                df = pd.read_csv(source, encoding="utf-8", **kwargs)
+    metrics.inc("rows_total", len(df), phase="parse")
+    if local:
+        metrics.inc("bytes_total", Path(file_path).stat().st_size, phase="parse")
+    return df
 
 
 def read_parquet(
@@ -48,5 +118,355 @@ def detect_encoding(file_path: Union[str, Path]) -> str:
     Returns:
         Detected encoding name (defaults to utf-8)
     """
-    # TODO: Implement proper encoding detection
-    return "utf-8"
\ No newline at end of file
+    return sniff_file(file_path).encoding
+
+
+def sniff_file(
+    file_path: Union[str, Path],
+    sample_size: int = SAMPLE_SIZE
+) -> FileDialect:
+    """Detect encoding, delimiter, line terminator and record length
+
+    Blocks of sample_size bytes are read from the head, middle and tail
+    of the file (for ``.gz``/``.zst``/``.zip`` files, of its first
+    COMPRESSED_SCAN_SIZE decompressed bytes). The delimiter and record
+    length come from the head; the encoding must fit every block.
+
+    Results are cached by a fingerprint of the file's contents (its size
+    and a hash of its raw head, middle and tail blocks), so the same data
+    is recognized under any path, e.g. as a freshly spooled upload.
+
+    Args:
+        file_path: Path to the text file
+        sample_size: Number of bytes per sampled block
+
+    Returns:
+        FileDialect describing the file
+    """
+    path = Path(file_path)
+    size = path.stat().st_size
+    with open(path, "rb") as raw:
+        raw_blocks = _sample_blocks(raw, size, sample_size)
+    digest = hashlib.blake2b(digest_size=16)
+    for block in raw_blocks:
+        digest.update(block)
+    key = (size, digest.hexdigest(), path.suffix.lower(), sample_size)
+
+    with _dialect_cache_lock:
+        dialect = _dialect_cache.get(key)
+        if dialect is not None:
+            _dialect_cache.move_to_end(key)
+            metrics.inc("dialect_cache_hits_total")
+            return dialect
+
+    with metrics.span("phase", phase="sniff"):
+        if path.suffix.lower() in COMPRESSED_SUFFIXES:
+            with open_decompressed(path) as source:
+                data = source.read(COMPRESSED_SCAN_SIZE)
+            blocks = _sample_blocks(io.BytesIO(data), len(data), sample_size)
+            complete = len(blocks) == 1 and len(data) < COMPRESSED_SCAN_SIZE
+        else:
+            blocks = raw_blocks
+            complete = len(blocks) == 1
+        dialect = _sniff_blocks(blocks, complete)
+
+    with _dialect_cache_lock:
+        _dialect_cache[key] = dialect
+        if len(_dialect_cache) > _DIALECT_CACHE_SIZE:
+            _dialect_cache.popitem(last=False)
+    return dialect
+
+
+def _sample_blocks(source: BinaryIO, size: int, block_size: int) -> list[bytes]:
+    """Read the head, middle and tail blocks of a seekable stream
+
+    Args:
+        source: Seekable binary stream positioned at its start
+        size: Total size of the stream
+        block_size: Number of bytes per block
+
+    Returns:
+        The three blocks, or the whole content as a single block when it
+        is no larger than three blocks
+    """
+    if size <= 3 * block_size:
+        return [source.read()]
+    blocks = []
+    for offset in (0, (size - block_size) // 2, size - block_size):
+        source.seek(offset)
+        blocks.append(source.read(block_size))
+    return blocks
+
+
+def _sniff_blocks(blocks: list[bytes], complete: bool) -> FileDialect:
+    """Detect the dialect of sampled blocks
+
+    Args:
+        blocks: Head, middle and tail blocks (or only the head)
+        complete: Whether the single block holds the whole file
+
+    Returns:
+        FileDialect describing the file
+    """
+    # Blocks after the head start and may end mid-line (and mid-character)
+    lines = [blocks[0]] + [
+        block[block.find(b"\n") + 1:block.rfind(b"\n") + 1] for block in blocks[1:]
+    ]
+    encoding = _detect_sample_encoding(lines, complete)
+    codec = "utf-8" if encoding == ASCII_ENCODING else encoding
+    text = blocks[0].decode(codec, errors="replace")
+
+    if "\r\n" in text:
+        line_terminator = "\r\n"
+    elif "\n" not in text and "\r" in text:
+        line_terminator = "\r"
+    else:
+        line_terminator = "\n"
+
+    lines = text.split(line_terminator)
+    if not complete or lines[-1] == "":
+        # The last line is cut off by the sample (or empty after the final newline)
+        lines = lines[:-1]
+    lines = lines[:1000]
+
+    try:
+        sample = "\n".join(lines[:100])
+        delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        delimiter = None
+
+    lengths = {len(line) for line in lines}
+    record_length = lengths.pop() if len(lines) > 1 and len(lengths) == 1 else None
+
+    return FileDialect(
+        encoding=encoding,
+        delimiter=delimiter,
+        line_terminator=line_terminator,
+        record_length=record_length
+    )
+
+
+def _detect_sample_encoding(blocks: list[bytes], complete: bool) -> str:
+    """Detect the encoding of sampled blocks
+
+    Blocks holding only ASCII give no evidence for any encoding, so
+    ``ascii`` is returned and readers decide once they meet the first
+    non-ASCII byte (see Utf8Transcoder). Otherwise UTF-8 is tried first
+    since it rarely decodes non-UTF-8 text by accident, then chardet's
+    guess when it is confident; small samples of Western text often are
+    not, so the fallback is cp1252 and then latin-1.
+
+    Args:
+        blocks: Sampled blocks, all but the head cut at line boundaries
+        complete: Whether the single block holds the whole file
+
+    Returns:
+        Python codec name
+    """
+    if blocks[0].startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if all(block.isascii() for block in blocks):
+        return ASCII_ENCODING
+
+    try:
+        # A multi-byte character may be split at the end of a partial head
+        codecs.getincrementaldecoder("utf-8")().decode(blocks[0], final=complete)
+        for block in blocks[1:]:
+            block.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    candidates = list(FALLBACK_ENCODINGS)
+    if chardet is not None:
+        guess = chardet.detect(b"".join(blocks))
+        confidence = guess.get("confidence", 0)
+        if guess.get("encoding") and confidence >= MIN_CHARDET_CONFIDENCE:
+            candidates.insert(0, guess["encoding"].lower())
+
+    for encoding in candidates:
+        try:
+            for block in blocks:
+                block.decode(encoding)
+            return encoding
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return "latin-1"
+
+
+class Utf8Transcoder:
+    """Incrementally convert text in a detected encoding to UTF-8
+
+    UTF-8 input is passed through unchanged. Input detected as ``ascii``
+    is passed through while it stays ASCII; at the first non-ASCII block
+    the rest is decoded as UTF-8 if that block is valid UTF-8, otherwise
+    with the first fallback encoding that decodes it (e.g. a Latin-1 file
+    whose accented rows all come after the sampled blocks).
+    """
+
+    def __init__(self, encoding: str):
+        """Initialize a transcoder
+
+        Args:
+            encoding: Encoding detected by sniff_file
+        """
+        self.encoding = encoding
+        self._decoder = None
+        if encoding not in UTF8_ENCODINGS and encoding != ASCII_ENCODING:
+            self._decoder = codecs.getincrementaldecoder(encoding)()
+
+    def convert(self, block: bytes, final: bool = False) -> bytes:
+        """Convert the next block of input
+
+        Args:
+            block: Next bytes of the input
+            final: Whether this is the last block
+
+        Returns:
+            The block as UTF-8 bytes
+        """
+        if self._decoder is None:
+            if self.encoding != ASCII_ENCODING or block.isascii():
+                return block
+            self._decoder = self._detect(block, final)
+        return self._decoder.decode(block, final=final).encode("utf-8")
+
+    def _detect(self, block: bytes, final: bool) -> codecs.IncrementalDecoder:
+        """Pick the decoder for input that stopped being ASCII"""
+        for encoding in ("utf-8", *FALLBACK_ENCODINGS):
+            try:
+                codecs.getincrementaldecoder(encoding)().decode(block, final=final)
+            except UnicodeDecodeError:
+                continue
+            self.encoding = encoding
+            break
+        return codecs.getincrementaldecoder(self.encoding)()
+
+
+class _Utf8Reader(io.RawIOBase):
+    """Readable stream converting another binary stream to UTF-8"""
+
+    def __init__(self, source: BinaryIO, encoding: str):
+        self._source = source
+        self._transcoder = Utf8Transcoder(encoding)
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and not self._eof:
+            block = self._source.read(TRANSCODE_CHUNK_SIZE)
+            self._eof = not block
+            self._buffer = memoryview(self._transcoder.convert(block, final=self._eof))
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._source.close()
+        super().close()
+
+
+def open_utf8(
+    file_path: Union[str, Path],
+    encoding: str,
+    fileobj: Optional[BinaryIO] = None
+) -> BinaryIO:
+    """Open a (possibly compressed) text file as a UTF-8 byte stream
+
+    Args:
+        file_path: Path to the file
+        encoding: Encoding detected by sniff_file
+        fileobj: Already opened raw file (see open_decompressed)
+
+    Returns:
+        Readable binary stream with the contents converted to UTF-8
+    """
+    source = open_decompressed(file_path, fileobj)
+    return io.BufferedReader(_Utf8Reader(source, encoding), TRANSCODE_CHUNK_SIZE)
+
+
+def transcode_to_utf8(
+    file_path: Union[str, Path],
+    encoding: str,
+    chunk_size: int = 8 * 1024 * 1024
+) -> Path:
+    """Stream a (possibly compressed) text file into a UTF-8 temporary file
+
+    Args:
+        file_path: Path to the source file
+        encoding: Encoding of the source file
+        chunk_size: Number of bytes copied at a time
+
+    Returns:
+        Path to the temporary UTF-8 file; the caller removes it
+    """
+    path = Path(file_path)
+    if path.suffix.lower() in COMPRESSED_SUFFIXES:
+        path_suffix = Path(path.stem).suffix
+    else:
+        path_suffix = path.suffix
+
+    with metrics.span("phase", phase="transcode"):
+        with open_utf8(path, encoding) as source, tempfile.NamedTemporaryFile(
+            "wb", suffix=path_suffix, delete=False
+        ) as target:
+            shutil.copyfileobj(source, target, chunk_size)
+    return Path(target.name)
+
+
+def open_decompressed(
+    file_path: Union[str, Path], fileobj: Optional[BinaryIO] = None
+) -> BinaryIO:
+    """Open a file as a binary stream, decompressing it on the fly
+
+    ``.gz`` and ``.zst`` files are decompressed as they are read; for
+    ``.zip`` archives the first file member is streamed. Other files are
+    opened as-is.
+
+    Args:
+        file_path: Path to the (possibly compressed) file
+        fileobj: Already opened raw file to read instead of opening
+            file_path, e.g. to follow how much of it was consumed. The
+            caller closes it; uncompressed files return it unchanged.
+
+    Returns:
+        Readable binary stream with the uncompressed contents
+
+    Raises:
+        ImportError: If the file is zstd-compressed and zstandard is not installed
+        ValueError: If a zip archive has no file members
+    """
+    path = Path(file_path)
+    suffix = path.suffix.lower()
+
+    if suffix == ".gz":
+        if fileobj is not None:
+            return gzip.GzipFile(fileobj=fileobj, mode="rb")
+        return gzip.open(path, "rb")
+
+    if suffix == ".zst":
+        if zstandard is None:
+            raise ImportError("Install zstandard to read .zst files")
+        raw = fileobj if fileobj is not None else open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            raw, closefd=fileobj is None
+        )
+        return io.BufferedReader(reader)
+
+    if suffix == ".zip":
+        archive = zipfile.ZipFile(fileobj if fileobj is not None else path)
+        members = [info for info in archive.infolist() if not info.is_dir()]
+        if not members:
+            archive.close()
+            raise ValueError(f"Zip archive '{path.name}' has no files")
+        member = archive.open(members[0])
+        # The member keeps the underlying file open until it is closed itself
+        archive.close()
+        return member
+
+    return fileobj if fileobj is not None else open(path, "rb")
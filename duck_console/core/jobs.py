@@ -0,0 +1,405 @@
+"""
+Background ingestion job queue
+"""
+import errno
+import logging
+import os
+import socket
+import tempfile
+import threading
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Literal, Optional, Union
+
+from pydantic import BaseModel
+
+from duck_console.core.duck_engine import DuckEngine
+from duck_console.core.layout_importer import LayoutImporter
+from duck_console.core.upload import load_file
+from duck_console.utils.io_helpers import ensure_directory
+from duck_console.utils.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+JobStatus = Literal["queued", "running", "completed", "failed"]
+
+
+class IngestionJob(BaseModel):
+    """State of a file import running in the background
+
+    ``owner_pid`` and ``owner_host`` identify the process running the
+    job; jobs without a live owner are adopted by the next JobQueue.
+    """
+    id: str
+    table_name: str
+    file_path: str
+    layout_name: Optional[str] = None
+    delete_source: bool = False
+    status: JobStatus = "queued"
+    rows_done: int = 0
+    bytes_total: int = 0
+    bytes_done: int = 0
+    error: Optional[str] = None
+    owner_pid: Optional[int] = None
+    owner_host: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+def load_jobs(state_dir: Union[str, Path]) -> list[IngestionJob]:
+    """Read persisted jobs without starting a queue
+
+    Args:
+        state_dir: Directory holding one JSON file per job
+
+    Returns:
+        List of jobs, oldest first (empty if the directory does not exist)
+    """
+    jobs = []
+    for path in Path(state_dir).glob("*.json"):
+        try:
+            jobs.append(IngestionJob.model_validate_json(path.read_text()))
+        except FileNotFoundError:  # removed while listing
+            continue
+    return sorted(jobs, key=lambda job: job.created_at)
+
+
+def read_job(state_dir: Union[str, Path], job_id: str) -> IngestionJob:
+    """Read the persisted state of one job
+
+    Args:
+        state_dir: Directory holding one JSON file per job
+        job_id: Job identifier
+
+    Returns:
+        The job's last saved state
+
+    Raises:
+        KeyError: If the job does not exist
+    """
+    try:
+        text = (Path(state_dir) / f"{job_id}.json").read_text()
+    except FileNotFoundError:
+        raise KeyError(f"Job '{job_id}' not found") from None
+    return IngestionJob.model_validate_json(text)
+
+
+def enqueue_job(
+    state_dir: Union[str, Path],
+    file_path: Union[str, Path],
+    table_name: str,
+    layout_name: Optional[str] = None,
+    delete_source: bool = False
+) -> IngestionJob:
+    """Queue a file import for another process to run
+
+    The job is written without an owner, so it is adopted by a running
+    JobQueue on the same state directory (e.g. the web console's).
+
+    Args:
+        state_dir: Directory holding one JSON file per job
+        file_path: Path to the file to import
+        table_name: Name of the table to create
+        layout_name: Registered layout for fixed-width files (CSV if None)
+        delete_source: Remove the file once the job finishes
+
+    Returns:
+        The queued IngestionJob
+    """
+    job = _new_job(file_path, table_name, layout_name, delete_source)
+    _write_job(ensure_directory(state_dir), job)
+    return job
+
+
+def cancel_job(state_dir: Union[str, Path], job_id: str) -> bool:
+    """Remove a job queued with enqueue_job that no queue has adopted yet
+
+    Args:
+        state_dir: Directory holding one JSON file per job
+        job_id: Job identifier
+
+    Returns:
+        True if the job was removed, False if a queue already owns it
+
+    Raises:
+        KeyError: If the job does not exist
+    """
+    state_dir = Path(state_dir)
+    with _claim_lock(state_dir):
+        if read_job(state_dir, job_id).owner_pid is not None:
+            return False
+        (state_dir / f"{job_id}.json").unlink()
+    return True
+
+
+@contextmanager
+def _claim_lock(state_dir: Path) -> Iterator[None]:
+    """Hold the lock that serializes claiming jobs across processes"""
+    if fcntl is None:
+        yield
+        return
+    with open(state_dir / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _new_job(
+    file_path: Union[str, Path],
+    table_name: str,
+    layout_name: Optional[str],
+    delete_source: bool
+) -> IngestionJob:
+    """Create the initial state of a job"""
+    path = Path(file_path).resolve()
+    return IngestionJob(
+        id=uuid.uuid4().hex,
+        table_name=table_name,
+        file_path=str(path),
+        layout_name=layout_name,
+        delete_source=delete_source,
+        bytes_total=path.stat().st_size,
+        created_at=datetime.now()
+    )
+
+
+def _write_job(state_dir: Path, job: IngestionJob) -> None:
+    """Atomically replace the state file of a job"""
+    with tempfile.NamedTemporaryFile(
+        "w", dir=state_dir, suffix=".tmp", delete=False
+    ) as temp:
+        temp.write(job.model_dump_json(indent=2))
+    os.replace(temp.name, state_dir / f"{job.id}.json")
+
+
+def _owner_alive(job: IngestionJob) -> bool:
+    """Whether the process that owns a job is still running
+
+    Owners on other hosts cannot be checked and are assumed alive.
+    """
+    if job.owner_pid is None:
+        return False
+    if job.owner_host != socket.gethostname():
+        return True
+    try:
+        os.kill(job.owner_pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+
+class JobQueue:
+    """Runs file imports on a bounded worker pool
+
+    Every job is persisted to its own JSON file in ``state_dir`` and is
+    only written by the queue that owns it, so several processes (e.g. the
+    web console and the CLI) can share the directory. Queued jobs whose
+    owner is gone are adopted on startup and, with ``adopt``, while the
+    queue runs. Imports into the same table are serialized by a per-table
+    lock.
+    """
+
+    def __init__(
+        self,
+        engine: DuckEngine,
+        state_dir: Union[str, Path] = "data/jobs",
+        max_workers: int = 2,
+        importer: Optional[LayoutImporter] = None,
+        adopt: bool = True,
+        poll_interval: float = 2.0
+    ):
+        """Initialize the queue and adopt jobs left without an owner
+
+        Args:
+            engine: DuckEngine receiving the imported tables
+            state_dir: Directory holding one JSON file per job
+            max_workers: Maximum number of imports running at once
+            importer: LayoutImporter holding layouts for fixed-width jobs
+            adopt: Run jobs left by dead processes or queued with
+                enqueue_job, checking every poll_interval seconds
+            poll_interval: Seconds between checks for jobs to adopt
+        """
+        self.engine = engine
+        self.state_dir = ensure_directory(state_dir)
+        self.importer = importer or LayoutImporter()
+        self.owner_pid = os.getpid()
+        self.owner_host = socket.gethostname()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="duck-ingest"
+        )
+        self._lock = threading.Lock()
+        self._table_locks: defaultdict[str, threading.Lock] = defaultdict(
+            threading.Lock
+        )
+        self._stopped = threading.Event()
+        self.jobs: dict[str, IngestionJob] = {}
+
+        self._watcher = None
+        if adopt:
+            self.adopt_jobs()
+            self._watcher = threading.Thread(
+                target=self._watch,
+                args=(poll_interval,),
+                name="duck-ingest-watch",
+                daemon=True
+            )
+            self._watcher.start()
+
+    def submit(
+        self,
+        file_path: Union[str, Path],
+        table_name: str,
+        layout_name: Optional[str] = None,
+        delete_source: bool = False
+    ) -> IngestionJob:
+        """Queue a file import
+
+        Args:
+            file_path: Path to the file to import
+            table_name: Name of the table to create
+            layout_name: Registered layout for fixed-width files (CSV if None)
+            delete_source: Remove the file once the job finishes
+
+        Returns:
+            The queued IngestionJob
+        """
+        job = _new_job(file_path, table_name, layout_name, delete_source)
+        job.owner_pid = self.owner_pid
+        job.owner_host = self.owner_host
+        with self._lock:
+            self.jobs[job.id] = job
+            _write_job(self.state_dir, job)
+        self._executor.submit(self._run, job.id)
+        return job
+
+    def adopt_jobs(self) -> list[IngestionJob]:
+        """Claim and run unfinished jobs whose owner is no longer running
+
+        Returns:
+            Copies of the adopted jobs
+        """
+        adopted = []
+        with _claim_lock(self.state_dir):
+            for job in load_jobs(self.state_dir):
+                if job.status not in ("queued", "running") or _owner_alive(job):
+                    continue
+                job.status = "queued"
+                job.owner_pid = self.owner_pid
+                job.owner_host = self.owner_host
+                with self._lock:
+                    self.jobs[job.id] = job
+                    _write_job(self.state_dir, job)
+                adopted.append(job.model_copy())
+
+        for job in adopted:
+            self._executor.submit(self._run, job.id)
+        return adopted
+
+    def get(self, job_id: str) -> IngestionJob:
+        """Get a job by id
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Copy of the job's current state
+
+        Raises:
+            KeyError: If the job does not exist
+        """
+        with self._lock:
+            if job_id in self.jobs:
+                return self.jobs[job_id].model_copy()
+        return read_job(self.state_dir, job_id)
+
+    def list_jobs(self) -> list[IngestionJob]:
+        """Get all jobs in the state directory, newest first
+
+        Returns:
+            List with the current state of each job
+        """
+        return list(reversed(load_jobs(self.state_dir)))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and optionally wait for running jobs
+
+        Args:
+            wait: Block until queued and running jobs finish
+        """
+        self._stopped.set()
+        self._executor.shutdown(wait=wait)
+
+    def _watch(self, poll_interval: float) -> None:
+        """Watcher thread: adopt new unowned jobs until shutdown"""
+        while not self._stopped.wait(poll_interval):
+            try:
+                self.adopt_jobs()
+            except Exception:
+                logger.exception("Failed to adopt queued import jobs")
+
+    def _table_lock(self, table_name: str) -> threading.Lock:
+        """Get the write lock of a table"""
+        with self._lock:
+            return self._table_locks[table_name]
+
+    def _update(self, job: IngestionJob, **changes) -> None:
+        """Apply changes to a job and persist its state file"""
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            _write_job(self.state_dir, job)
+
+    def _progress(
+        self, job: IngestionJob, rows: int, bytes_done: Optional[int]
+    ) -> None:
+        """Record the progress reported by load_file"""
+        if bytes_done is None:
+            self._update(job, rows_done=rows)
+        else:
+            self._update(job, rows_done=rows, bytes_done=bytes_done)
+
+    def _run(self, job_id: str) -> None:
+        """Worker entry point: import the file of a job"""
+        job = self.jobs[job_id]
+        path = Path(job.file_path)
+
+        with self._table_lock(job.table_name):
+            self._update(job, status="running", started_at=datetime.now())
+            metrics.add_gauge("running_jobs", 1)
+            try:
+                info = load_file(
+                    self.engine,
+                    path,
+                    job.table_name,
+                    importer=self.importer,
+                    layout_name=job.layout_name,
+                    progress=lambda rows, done: self._progress(job, rows, done)
+                )
+                self._update(
+                    job,
+                    status="completed",
+                    rows_done=info.row_count if info else 0,
+                    bytes_done=job.bytes_total,
+                    finished_at=datetime.now()
+                )
+            except Exception as e:
+                self._update(
+                    job, status="failed", error=str(e), finished_at=datetime.now()
+                )
+            finally:
+                metrics.add_gauge("running_jobs", -1)
+                metrics.inc("jobs_total", status=job.status)
+                if job.delete_source:
+                    path.unlink(missing_ok=True)
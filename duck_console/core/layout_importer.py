@@ -3,11 +3,14 @@ Fixed-width layout file importer
 """
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 
 import pandas as pd
 from pydantic import BaseModel
 
+from duck_console.core.file_reader import open_utf8, sniff_file
+from duck_console.utils.metrics import metrics
+
 
 class FieldDefinition(BaseModel):
     """Definition of a field in a fixed-width layout"""
@@ -18,9 +21,12 @@ class FieldDefinition(BaseModel):
 
 
 class LayoutDefinition(BaseModel):
-    """Definition of a complete fixed-width file layout"""
+    """Definition of a complete fixed-width file layout
+
+    When encoding is None it is detected from a sample of each file.
+    """
     fields: List[FieldDefinition]
-    encoding: str = "utf-8"
+    encoding: Optional[str] = None
     skip_rows: int = 0
 
 
@@ -59,22 +65,90 @@ class LayoutImporter:
         Raises:
             KeyError: If layout_name is not registered
         """
+        encoding, options = self._read_options(layout_name, file_path)
+        with metrics.span("phase", phase="parse", format="layout", layout=layout_name):
+            with open_utf8(file_path, encoding) as source:
+                df = pd.read_fwf(source, nrows=nrows, **options)
+        metrics.inc("rows_total", len(df), phase="parse")
+        metrics.inc("bytes_total", Path(file_path).stat().st_size, phase="parse")
+        return df
+
+    def iter_chunks(
+        self,
+        file_path: Union[str, Path],
+        layout_name: str,
+        chunksize: int = 100_000
+    ) -> Iterator[pd.DataFrame]:
+        """Import a fixed-width file in chunks using a registered layout
+
+        Only one chunk is held in memory at a time. Files ending in
+        ``.gz``, ``.zst`` or ``.zip`` are decompressed as they are read.
+
+        Args:
+            file_path: Path to the fixed-width file
+            layout_name: Name of the registered layout to use
+            chunksize: Number of rows per chunk
+
+        Yields:
+            Pandas DataFrames with up to chunksize rows each
+
+        Raises:
+            KeyError: If layout_name is not registered
+        """
+        encoding, options = self._read_options(layout_name, file_path)
+        with open_utf8(file_path, encoding) as source:
+            with pd.read_fwf(source, chunksize=chunksize, **options) as reader:
+                while True:
+                    with metrics.span(
+                        "phase", phase="parse", format="layout", layout=layout_name
+                    ):
+                        chunk = next(reader, None)
+                    if chunk is None:
+                        break
+                    metrics.inc("rows_total", len(chunk), phase="parse")
+                    yield chunk
+        metrics.inc("bytes_total", Path(file_path).stat().st_size, phase="parse")
+
+    def _read_options(
+        self, layout_name: str, file_path: Union[str, Path]
+    ) -> tuple[str, dict]:
+        """Build pandas.read_fwf arguments for a registered layout and file
+
+        The file is sniffed so that a missing encoding is detected and a
+        file whose fixed-length records end before a layout field starts is
+        rejected before parsing starts.
+
+        Args:
+            layout_name: Name of the registered layout
+            file_path: Path to the fixed-width file
+
+        Returns:
+            Encoding of the file and keyword arguments for pandas.read_fwf,
+            which reads it converted to UTF-8
+
+        Raises:
+            KeyError: If layout_name is not registered
+            ValueError: If a field starts beyond the file's fixed record length
+        """
         if layout_name not in self.layouts:
             raise KeyError(f"Layout '{layout_name}' not found")
-            
+
         layout = self.layouts[layout_name]
-        colspecs = [(f.start, f.start + f.length) for f in layout.fields]
-        names = [f.name for f in layout.fields]
-        dtypes = {f.name: f.dtype for f in layout.fields}
-        
-        df = pd.read_fwf(
-            file_path,
-            colspecs=colspecs,
-            names=names,
-            dtype=dtypes,
-            encoding=layout.encoding,
-            skiprows=layout.skip_rows,
-            nrows=nrows
-        )
-        
-        return df
\ No newline at end of file
+        dialect = sniff_file(file_path)
+        missing = [
+            f.name for f in layout.fields
+            if dialect.record_length is not None and f.start >= dialect.record_length
+        ]
+        if missing:
+            raise ValueError(
+                f"Records are {dialect.record_length} characters long; layout "
+                f"'{layout_name}' fields {', '.join(missing)} start past the end"
+            )
+
+        return layout.encoding or dialect.encoding, dict(
+            colspecs=[(f.start, f.start + f.length) for f in layout.fields],
+            names=[f.name for f in layout.fields],
+            dtype={f.name: f.dtype for f in layout.fields},
+            encoding="utf-8",
+            skiprows=layout.skip_rows
+        )
\ No newline at end of file
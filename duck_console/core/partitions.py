@@ -0,0 +1,216 @@
+"""
+Partitioned tables spread across several DuckDB database files
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+import duckdb
+import pandas as pd
+
+from duck_console.utils.io_helpers import ensure_directory, quote_identifier
+
+
+def _query_partition(path: str, query: str) -> pd.DataFrame:
+    """Run a query against a single partition file (worker thread entry point)
+
+    Each call opens its own connection; DuckDB releases the GIL while the
+    query runs, so partitions are scanned in parallel. The connection uses
+    the same (read-write) configuration as ``PartitionSet.ingest``, since
+    DuckDB refuses a second configuration for a file already open in this
+    process, so queries can run while partitions are being loaded.
+
+    Args:
+        path: Path to the partition database file
+        query: SQL query to run
+
+    Returns:
+        Pandas DataFrame with the partial result
+    """
+    conn = duckdb.connect(path)
+    try:
+        return conn.execute(query).fetchdf()
+    finally:
+        conn.close()
+
+
+class PartitionSet:
+    """A logical table whose partitions live in separate DuckDB files
+
+    Every partition file holds a table named after the logical table, so
+    one query can run unchanged against each partition. Partitions are
+    opened only while they are read or written, which lets different
+    partitions be loaded concurrently and old ones be removed cheaply.
+    Ingestion and queries share one worker pool, created on first use and
+    released by ``close``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        directory: Union[str, Path],
+        max_workers: Optional[int] = None
+    ):
+        """Initialize a partition set, picking up existing partition files
+
+        Args:
+            name: Name of the logical table
+            directory: Directory holding one ``<key>.duckdb`` file per partition
+            max_workers: Maximum parallel workers (defaults to the CPU count)
+        """
+        self.name = name
+        self.directory = ensure_directory(directory)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.partitions: dict[str, Path] = {
+            path.stem: path for path in sorted(self.directory.glob("*.duckdb"))
+        }
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Get the worker pool, creating it on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="duck-partition"
+                )
+            return self._executor
+
+    def path_for(self, key: str) -> Path:
+        """Get the database file of a partition
+
+        Args:
+            key: Partition key, e.g. ``2024_01``
+
+        Returns:
+            Path to the partition database file
+        """
+        return self.directory / f"{key}.duckdb"
+
+    def ingest(self, key: str, df: pd.DataFrame, replace: bool = False) -> int:
+        """Load rows into a partition, creating it if needed
+
+        Args:
+            key: Partition key
+            df: Pandas DataFrame with the rows to load
+            replace: Replace the partition contents instead of appending
+
+        Returns:
+            Number of rows in the partition after loading
+        """
+        path = self.path_for(key)
+        table = quote_identifier(self.name)
+        conn = duckdb.connect(str(path))
+        try:
+            exists = conn.execute(
+                "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+                [self.name]
+            ).fetchone()[0]
+            if replace or not exists:
+                conn.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM df")
+            else:
+                conn.execute(f"INSERT INTO {table} SELECT * FROM df")
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            conn.close()
+
+        self.partitions[key] = path
+        return count
+
+    def ingest_many(
+        self, frames: dict[str, pd.DataFrame], replace: bool = False
+    ) -> dict[str, int]:
+        """Load several partitions concurrently
+
+        Args:
+            frames: Mapping of partition key to the rows to load
+            replace: Replace the partition contents instead of appending
+
+        Returns:
+            Mapping of partition key to its row count after loading
+        """
+        pool = self._pool()
+        futures = {
+            key: pool.submit(self.ingest, key, df, replace)
+            for key, df in frames.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+    def query(
+        self,
+        query: str,
+        merge_query: Optional[str] = None,
+        keys: Optional[list[str]] = None
+    ) -> pd.DataFrame:
+        """Run a query on every partition in parallel and combine the results
+
+        The query runs on the worker pool, one task per partition. Partial
+        results are concatenated into a ``partials`` table; when
+        ``merge_query`` is given it is run over ``partials`` to
+        re-aggregate them (e.g. ``SELECT day, SUM(total) AS total FROM
+        partials GROUP BY day``).
+
+        Args:
+            query: SQL query over the logical table name
+            merge_query: Optional SQL combining the partial results
+            keys: Partition keys to query (defaults to all)
+
+        Returns:
+            Pandas DataFrame with the combined results
+
+        Raises:
+            KeyError: If a requested partition does not exist
+        """
+        keys = keys if keys is not None else list(self.partitions)
+        missing = [key for key in keys if key not in self.partitions]
+        if missing:
+            raise KeyError(f"Partitions not found: {', '.join(missing)}")
+        if not keys:
+            return pd.DataFrame()
+
+        paths = [str(self.partitions[key]) for key in keys]
+        results = list(self._pool().map(_query_partition, paths, [query] * len(paths)))
+
+        partials = pd.concat(results, ignore_index=True)
+        if merge_query is None:
+            return partials
+
+        conn = duckdb.connect(":memory:")
+        try:
+            conn.register("partials", partials)
+            return conn.execute(merge_query).fetchdf()
+        finally:
+            conn.close()
+
+    def detach(self, key: str, delete: bool = False) -> None:
+        """Remove a partition from the set
+
+        The file is kept unless ``delete`` is set, so a detached partition
+        is picked up again when the set is reopened on the same directory.
+
+        Args:
+            key: Partition key
+            delete: Also delete the partition database file
+
+        Raises:
+            KeyError: If the partition does not exist
+        """
+        if key not in self.partitions:
+            raise KeyError(f"Partition '{key}' not found")
+
+        path = self.partitions.pop(key)
+        if delete:
+            path.unlink(missing_ok=True)
+            Path(f"{path}.wal").unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Shut down the worker pool, waiting for running tasks
+
+        The set stays usable; a new pool is created on the next call.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,140 @@
+"""
+Python scalar functions (UDFs) for DuckDB
+"""
+import importlib.util
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is an optional dependency
+    pa = None
+
+BatchFormat = Literal["arrow", "numpy"]
+
+# Imported plugin modules by resolved path and modification time
+_plugin_modules: dict[tuple[str, int], ModuleType] = {}
+_plugin_modules_lock = threading.Lock()
+
+
+class FunctionDefinition(BaseModel):
+    """Definition of a Python scalar function registered in DuckDB"""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    name: str
+    function: Callable
+    arg_types: list[str]
+    return_type: str
+    vectorized: bool = True
+    batch_format: BatchFormat = "arrow"
+
+
+def udf(
+    arg_types: list[str],
+    return_type: str,
+    vectorized: bool = True,
+    batch_format: BatchFormat = "arrow",
+    name: Optional[str] = None
+) -> Callable[[Callable], Callable]:
+    """Mark a function in a plugin file for registration as a DuckDB UDF
+
+    Args:
+        arg_types: DuckDB type name of each argument, e.g. ["VARCHAR"]
+        return_type: DuckDB type name of the result
+        vectorized: Call the function once per batch instead of per row
+        batch_format: Pass batches as pyarrow arrays or numpy arrays
+        name: SQL function name (defaults to the Python function name)
+
+    Returns:
+        Decorator that attaches the definition and returns the function unchanged
+
+    Example:
+        @udf(["VARCHAR"], "VARCHAR")
+        def normalize(values):
+            return pyarrow.compute.utf8_upper(values)
+    """
+    def decorator(function: Callable) -> Callable:
+        function.__duck_udf__ = FunctionDefinition(
+            name=name or function.__name__,
+            function=function,
+            arg_types=arg_types,
+            return_type=return_type,
+            vectorized=vectorized,
+            batch_format=batch_format
+        )
+        return function
+    return decorator
+
+
+def wrap_numpy(function: Callable) -> Callable:
+    """Adapt a NumPy-vectorized function to DuckDB's Arrow UDF interface
+
+    Args:
+        function: Function taking and returning numpy arrays
+
+    Returns:
+        Function taking and returning pyarrow arrays
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if pa is None:
+        raise ImportError("Install pyarrow to register vectorized functions")
+
+    def wrapper(*arrays):
+        values = [array.to_numpy(zero_copy_only=False) for array in arrays]
+        return pa.array(function(*values))
+
+    wrapper.__name__ = function.__name__
+    return wrapper
+
+
+def discover_plugins(directory: Union[str, Path]) -> list[FunctionDefinition]:
+    """Import every ``*.py`` file of a directory and collect its UDFs
+
+    Each file is imported once per process and again only after it
+    changes, so engines loading the same plugins get the same function
+    objects (and share one registration, see DuckEngine.register_function).
+
+    Args:
+        directory: Directory with plugin modules using the ``udf`` decorator
+
+    Returns:
+        Function definitions found, in file name order
+
+    Raises:
+        FileNotFoundError: If the directory does not exist
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Plugin directory '{directory}' not found")
+
+    definitions = []
+    for path in sorted(directory.glob("*.py")):
+        module = _import_plugin(path)
+        definitions.extend(
+            value.__duck_udf__
+            for value in vars(module).values()
+            if callable(value) and hasattr(value, "__duck_udf__")
+        )
+    return definitions
+
+
+def _import_plugin(path: Path) -> ModuleType:
+    """Import a plugin file, reusing the module while the file is unchanged"""
+    key = (str(path.resolve()), path.stat().st_mtime_ns)
+    with _plugin_modules_lock:
+        if key not in _plugin_modules:
+            for stale in [k for k in _plugin_modules if k[0] == key[0]]:
+                del _plugin_modules[stale]
+            spec = importlib.util.spec_from_file_location(
+                f"duck_console_plugin_{path.stem}", path
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _plugin_modules[key] = module
+        return _plugin_modules[key]
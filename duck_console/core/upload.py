@@ -0,0 +1,228 @@
+"""
+Upload pipeline that loads files without holding them in Python memory
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional, Union
+
+import duckdb
+
+from duck_console.core.duck_engine import DuckEngine, TableInfo
+from duck_console.core.file_reader import (
+    ASCII_ENCODING,
+    UTF8_ENCODINGS,
+    open_utf8,
+    sniff_file,
+    transcode_to_utf8,
+)
+from duck_console.core.layout_importer import LayoutImporter
+from duck_console.utils.io_helpers import COMPRESSED_SUFFIXES, spool_to_file
+from duck_console.utils.metrics import metrics
+
+UPLOAD_TYPES = ['csv', 'txt', 'gz', 'zst', 'zip']
+PIPE_CHUNK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL = 0.5
+
+# Called with the rows loaded so far and the bytes of the source file
+# consumed so far (None when unknown)
+Progress = Callable[[int, Optional[int]], None]
+
+
+def load_file(
+    engine: DuckEngine,
+    file_path: Path,
+    table_name: str,
+    importer: Optional[LayoutImporter] = None,
+    layout_name: Optional[str] = None,
+    chunksize: int = 100_000,
+    progress: Optional[Progress] = None
+) -> TableInfo:
+    """Load a (possibly compressed) file from disk into a table
+
+    CSV files are parsed by DuckDB using the sniffed delimiter; gzip
+    files are read directly and ``.zst``/``.zip`` files are first
+    stream-decompressed to a temporary file. Files that are not UTF-8
+    are transcoded while streaming, since DuckDB only reads UTF-8; files
+    whose sampled blocks were pure ASCII are transcoded only if DuckDB
+    meets invalid UTF-8 further on. With
+    a layout, the file is imported chunk by chunk through the
+    LayoutImporter instead, in one transaction so a failing chunk keeps the
+    existing table, refreshing dependent summaries once at the end.
+
+    When ``progress`` is given and the platform has named pipes, CSV
+    files are instead decompressed and transcoded into a pipe that DuckDB
+    reads, so rows and bytes can be reported while the load runs.
+
+    Args:
+        engine: DuckEngine receiving the table
+        file_path: Path to the file
+        table_name: Name of the table to create
+        importer: LayoutImporter holding the layout (for fixed-width files)
+        layout_name: Name of the registered layout (for fixed-width files)
+        chunksize: Rows per chunk for fixed-width imports
+        progress: Called with the rows and source bytes loaded so far
+
+    Returns:
+        TableInfo with details about the created table
+
+    Raises:
+        ValueError: If layout_name is given without an importer
+    """
+    if layout_name is not None:
+        if importer is None:
+            raise ValueError("A LayoutImporter is required to import with a layout")
+        info = None
+        with engine.transaction():
+            for chunk in importer.iter_chunks(file_path, layout_name, chunksize):
+                if info is None:
+                    info = engine.create_table_from_df(
+                        table_name, chunk, refresh=False
+                    )
+                else:
+                    info = engine.append_df(table_name, chunk, refresh=False)
+                if progress is not None:
+                    progress(info.row_count, None)
+        if info is not None:
+            engine.refresh_dependents(table_name)
+        return info
+
+    dialect = sniff_file(file_path)
+    if progress is not None and hasattr(os, "mkfifo"):
+        with engine.transaction():
+            with _pipe_csv(file_path, dialect.encoding, progress) as pipe:
+                info = engine.create_table_from_csv(
+                    table_name, pipe, delimiter=dialect.delimiter, refresh=False
+                )
+        engine.refresh_dependents(table_name)
+        metrics.inc("bytes_total", file_path.stat().st_size, phase="load")
+        progress(info.row_count, file_path.stat().st_size)
+        return info
+
+    info = None
+    if (
+        dialect.encoding in (*UTF8_ENCODINGS, ASCII_ENCODING)
+        and file_path.suffix.lower() not in ('.zst', '.zip')
+    ):
+        try:
+            info = engine.create_table_from_csv(
+                table_name, file_path, delimiter=dialect.delimiter
+            )
+        except duckdb.InvalidInputException as e:
+            # Only the sampled blocks were ASCII; transcode the whole file
+            if dialect.encoding != ASCII_ENCODING or "unicode" not in str(e).lower():
+                raise
+
+    if info is None:
+        plain_path = transcode_to_utf8(file_path, dialect.encoding)
+        try:
+            info = engine.create_table_from_csv(
+                table_name, plain_path, delimiter=dialect.delimiter
+            )
+        finally:
+            plain_path.unlink(missing_ok=True)
+
+    if progress is not None:
+        progress(info.row_count, file_path.stat().st_size)
+    return info
+
+
+@contextmanager
+def _pipe_csv(file_path: Path, encoding: str, progress: Progress) -> Iterator[Path]:
+    """Feed a file as plain UTF-8 into a named pipe from a background thread
+
+    Yields the pipe path for DuckDB to read. Errors of the feeder (e.g. a
+    corrupt archive) are raised once the block ends, so the caller can
+    roll back a load that only saw part of the file.
+    """
+    directory = Path(tempfile.mkdtemp(prefix="duck-console-"))
+    pipe = directory / "data.csv"
+    os.mkfifo(pipe)
+    errors: list[Exception] = []
+    feeder = threading.Thread(
+        target=_feed_pipe,
+        args=(file_path, pipe, encoding, progress, errors),
+        name="duck-pipe",
+        daemon=True
+    )
+    feeder.start()
+    try:
+        yield pipe
+    finally:
+        while feeder.is_alive():
+            # Open and close the read end so a feeder that DuckDB never
+            # (or no longer) reads from fails with a broken pipe
+            os.close(os.open(pipe, os.O_RDONLY | os.O_NONBLOCK))
+            feeder.join(0.1)
+        shutil.rmtree(directory, ignore_errors=True)
+    if errors:
+        raise errors[0]
+
+
+def _feed_pipe(
+    file_path: Path,
+    pipe: Path,
+    encoding: str,
+    progress: Progress,
+    errors: list[Exception]
+) -> None:
+    """Copy a file into a named pipe as UTF-8 (feeder thread entry point)"""
+    lines = 0
+    reported = time.monotonic()
+    try:
+        with open(file_path, "rb") as raw, open(pipe, "wb") as target:
+            with open_utf8(file_path, encoding, raw) as source:
+                while True:
+                    block = source.read(PIPE_CHUNK_SIZE)
+                    if not block:
+                        break
+                    target.write(block)
+                    lines += block.count(b"\n")
+                    if time.monotonic() - reported >= PROGRESS_INTERVAL:
+                        # Line count minus the header; the exact count is
+                        # reported once DuckDB has loaded the table
+                        progress(max(lines - 1, 0), raw.tell())
+                        reported = time.monotonic()
+    except BrokenPipeError:
+        pass  # DuckDB stopped reading and raises its own error
+    except Exception as e:
+        errors.append(e)
+
+
+def upload_suffix(filename: str) -> str:
+    """Get the file suffix of an upload, keeping compression suffixes
+
+    Args:
+        filename: Original file name, e.g. "vendas.csv.gz"
+
+    Returns:
+        Suffix such as ".csv" or ".csv.gz"
+    """
+    path = Path(filename)
+    suffix = path.suffix.lower()
+    if suffix in COMPRESSED_SUFFIXES:
+        suffix = Path(path.stem).suffix.lower() + suffix
+    return suffix
+
+
+def spool_upload(
+    source: BinaryIO,
+    filename: str,
+    directory: Optional[Union[str, Path]] = None
+) -> Path:
+    """Copy an uploaded stream to disk so it can be loaded with load_file
+
+    Args:
+        source: Readable binary stream with the upload
+        filename: Original file name, used to keep its compression suffix
+        directory: Directory for the spooled file (system default if None)
+
+    Returns:
+        Path to the spooled file; the caller removes it (e.g. with a job's
+        ``delete_source``)
+    """
+    return spool_to_file(source, suffix=upload_suffix(filename), directory=directory)
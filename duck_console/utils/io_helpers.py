@@ -2,8 +2,12 @@
 I/O helper utilities
 """
 import re
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Optional, Union
+from typing import BinaryIO, Optional, Union
+
+COMPRESSED_SUFFIXES = ('.gz', '.zst', '.zip')
 
 
 def sanitize_table_name(filename: str) -> str:
@@ -15,8 +19,11 @@ def sanitize_table_name(filename: str) -> str:
     Returns:
         Sanitized table name
     """
-    # Remove extension
-    name = Path(filename).stem
+    # Remove extension (and compression suffix, e.g. data.csv.gz)
+    path = Path(filename)
+    if path.suffix.lower() in COMPRESSED_SUFFIXES:
+        path = Path(path.stem)
+    name = path.stem
     
     # Replace invalid characters with underscore
     name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
@@ -39,4 +46,40 @@ def ensure_directory(path: Union[str, Path]) -> Path:
     """
     path = Path(path)
     path.mkdir(parents=True, exist_ok=True)
-    return path
\ No newline at end of file
+    return path
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for use in SQL
+
+    Args:
+        name: Identifier to quote
+
+    Returns:
+        Identifier wrapped in double quotes with embedded quotes escaped
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def spool_to_file(
+    source: BinaryIO,
+    suffix: str = "",
+    chunk_size: int = 8 * 1024 * 1024,
+    directory: Optional[Union[str, Path]] = None
+) -> Path:
+    """Copy a binary stream to a temporary file in fixed-size chunks
+
+    Args:
+        source: Readable binary stream (e.g. an uploaded file)
+        suffix: Suffix for the temporary file, e.g. ".csv.gz"
+        chunk_size: Number of bytes copied at a time
+        directory: Directory for the temporary file (system default if None)
+
+    Returns:
+        Path to the temporary file; the caller is responsible for removing it
+    """
+    with tempfile.NamedTemporaryFile(
+        suffix=suffix, dir=directory, delete=False
+    ) as target:
+        shutil.copyfileobj(source, target, chunk_size)
+    return Path(target.name)
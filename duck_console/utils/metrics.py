@@ -0,0 +1,196 @@
+"""
+Metrics and tracing for imports and queries
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Literal
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "duck_console_"
+
+
+class MetricEvent(BaseModel):
+    """A single observation passed to metric hooks"""
+    kind: Literal["counter", "gauge", "span"]
+    name: str
+    value: float
+    labels: dict[str, str] = {}
+
+
+MetricHook = Callable[[MetricEvent], None]
+LabelKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class MetricsRegistry:
+    """Collects counters, gauges and timing spans
+
+    Values are kept in memory for the Prometheus text export, and every
+    observation is also forwarded to the registered hooks.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._lock = threading.Lock()
+        self._counters: dict[LabelKey, float] = {}
+        self._gauges: dict[LabelKey, float] = {}
+        self._spans: dict[LabelKey, list[float]] = {}
+        self._hooks: list[MetricHook] = []
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increase a counter
+
+        Args:
+            name: Counter name without prefix, e.g. "rows_total"
+            value: Amount to add
+            **labels: Label values for this series
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._emit("counter", name, value, labels)
+
+    def add_gauge(self, name: str, delta: float, **labels: str) -> None:
+        """Move a gauge up or down
+
+        Args:
+            name: Gauge name without prefix, e.g. "active_sessions"
+            delta: Amount to add (negative to decrease)
+            **labels: Label values for this series
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            value = self._gauges[key] = self._gauges.get(key, 0) + delta
+        self._emit("gauge", name, value, labels)
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Record the duration of a span
+
+        Args:
+            name: Span name without prefix, e.g. "phase"
+            seconds: Elapsed time in seconds
+            **labels: Label values for this series
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            summary = self._spans.setdefault(key, [0, 0.0])
+            summary[0] += 1
+            summary[1] += seconds
+        self._emit("span", name, seconds, labels)
+
+    @contextmanager
+    def span(self, name: str, **labels: str) -> Iterator[None]:
+        """Time a block of code
+
+        Args:
+            name: Span name without prefix, e.g. "phase"
+            **labels: Label values for this series
+
+        Example:
+            with metrics.span("phase", phase="parse"):
+                df = pd.read_csv(path)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def add_hook(self, hook: MetricHook) -> None:
+        """Register a callable receiving every MetricEvent
+
+        Args:
+            hook: Function called with each observation
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: MetricHook) -> None:
+        """Unregister a previously added hook
+
+        Args:
+            hook: Function passed to add_hook
+        """
+        self._hooks.remove(hook)
+
+    def get(self, name: str, **labels: str) -> float:
+        """Get the current value of a counter or gauge
+
+        Args:
+            name: Metric name without prefix
+            **labels: Label values of the series
+
+        Returns:
+            Current value (0 if never recorded)
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            return self._counters.get(key, self._gauges.get(key, 0))
+
+    def render_prometheus(self) -> str:
+        """Export all metrics in the Prometheus text exposition format
+
+        Returns:
+            Metrics text, spans exported as summaries in seconds
+        """
+        lines = []
+        with self._lock:
+            for kind, series in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted({key[0] for key in series}):
+                    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                    for key, value in sorted(series.items()):
+                        if key[0] == name:
+                            labels = self._labels(key[1])
+                            lines.append(f"{PREFIX}{name}{labels} {value}")
+
+            for name in sorted({key[0] for key in self._spans}):
+                lines.append(f"# TYPE {PREFIX}{name}_seconds summary")
+                for key, (count, total) in sorted(self._spans.items()):
+                    if key[0] == name:
+                        labels = self._labels(key[1])
+                        lines.append(f"{PREFIX}{name}_seconds_count{labels} {count}")
+                        lines.append(f"{PREFIX}{name}_seconds_sum{labels} {total}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear all recorded values (hooks are kept)"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._spans.clear()
+
+    def _emit(self, kind: str, name: str, value: float, labels: dict[str, str]) -> None:
+        """Forward an observation to the hooks, isolating hook failures"""
+        if not self._hooks:
+            return
+        event = MetricEvent(
+            kind=kind,
+            name=name,
+            value=value,
+            labels={k: str(v) for k, v in labels.items()}
+        )
+        for hook in list(self._hooks):
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Metric hook %r failed", hook)
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, str]) -> LabelKey:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    @staticmethod
+    def _labels(items: tuple[tuple[str, str], ...]) -> str:
+        if not items:
+            return ""
+        escaped = (
+            (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for k, v in items
+        )
+        return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+metrics = MetricsRegistry()
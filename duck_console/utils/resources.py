@@ -0,0 +1,58 @@
+"""
+System resource monitoring utilities
+"""
+import os
+from typing import Optional
+
+from pydantic import BaseModel
+
+try:
+    import psutil
+except ImportError:  # psutil is an optional dependency
+    psutil = None
+
+
+class ResourceUsage(BaseModel):
+    """Snapshot of host and process resource usage"""
+    cpu_percent: float
+    memory_percent: float
+    memory_available: int
+    process_rss: int
+    process_threads: int
+
+
+def get_resource_usage() -> Optional[ResourceUsage]:
+    """Get current CPU and memory usage of the host and this process
+
+    Returns:
+        ResourceUsage snapshot, or None if psutil is not installed
+    """
+    if psutil is None:
+        return None
+
+    memory = psutil.virtual_memory()
+    process = psutil.Process(os.getpid())
+    return ResourceUsage(
+        cpu_percent=psutil.cpu_percent(interval=None),
+        memory_percent=memory.percent,
+        memory_available=memory.available,
+        process_rss=process.memory_info().rss,
+        process_threads=process.num_threads()
+    )
+
+
+def format_bytes(size: int) -> str:
+    """Format a byte count for display
+
+    Args:
+        size: Number of bytes
+
+    Returns:
+        Human readable size, e.g. "1.5 GB"
+    """
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
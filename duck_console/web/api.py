@@ -0,0 +1,51 @@
+"""
+HTTP endpoints for monitoring duck-console
+"""
+import threading
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from duck_console.utils.metrics import metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_app() -> FastAPI:
+    """Create the monitoring API
+
+    Returns:
+        FastAPI application exposing ``/metrics``
+    """
+    app = FastAPI(title="Duck Console metrics")
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def get_metrics() -> PlainTextResponse:
+        """Metrics in the Prometheus text format"""
+        return PlainTextResponse(
+            metrics.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE
+        )
+
+    return app
+
+
+def start_metrics_server(host: str = "0.0.0.0", port: int = 9108) -> threading.Thread:
+    """Serve the monitoring API from a background thread
+
+    Metrics live in process memory, so the server has to run inside the
+    process doing the work (e.g. the Streamlit server).
+
+    Args:
+        host: Interface to bind
+        port: Port to listen on
+
+    Returns:
+        The daemon thread running the server
+    """
+    config = uvicorn.Config(create_app(), host=host, port=port, log_level="warning")
+    thread = threading.Thread(
+        target=uvicorn.Server(config).run, name="duck-metrics", daemon=True
+    )
+    thread.start()
+    return thread
@@ -2,22 +2,140 @@
 Streamlit web interface for duck-console
 """
 import os
+import weakref
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
 import streamlit as st
 
-from duck_console.core.duck_engine import DuckEngine
-from duck_console.core.file_reader import read_csv
-from duck_console.utils.io_helpers import sanitize_table_name
+from duck_console.core.duck_engine import DuckEngine, EngineConfig
+from duck_console.core.jobs import JobQueue
+from duck_console.core.upload import UPLOAD_TYPES, spool_upload
+from duck_console.utils.io_helpers import ensure_directory, sanitize_table_name
+from duck_console.utils.metrics import metrics
+from duck_console.utils.resources import format_bytes, get_resource_usage
+from duck_console.web.api import start_metrics_server
+
+
+def create_engine(config: Optional[EngineConfig] = None) -> DuckEngine:
+    """Create an engine on the console database
+
+    Resource limits are shared by every engine on the database, so only
+    the server-wide job queue passes the limits from the environment;
+    session engines leave them alone, keeping changes made in the sidebar.
+    """
+    os.makedirs('data', exist_ok=True)
+    return DuckEngine(
+        'data/database.duckdb',
+        config=config,
+        plugin_directory=os.environ.get('DUCK_CONSOLE_PLUGIN_DIRECTORY') or None
+    )
 
 
 def init_session_state():
     """Initialize Streamlit session state"""
     if 'engine' not in st.session_state:
-        os.makedirs('data', exist_ok=True)
-        st.session_state.engine = DuckEngine('data/database.duckdb')
+        st.session_state.engine = create_engine()
+        metrics.add_gauge("active_sessions", 1)
+        weakref.finalize(
+            st.session_state.engine, metrics.add_gauge, "active_sessions", -1
+        )
+
+
+@st.cache_resource
+def init_metrics_server():
+    """Start the metrics endpoint once per server if a port is configured"""
+    port = os.environ.get('DUCK_CONSOLE_METRICS_PORT')
+    if port:
+        return start_metrics_server(port=int(port))
+
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Get the ingestion queue shared by all sessions of this server"""
+    return JobQueue(
+        create_engine(EngineConfig.from_env()),
+        'data/jobs',
+        max_workers=int(os.environ.get('DUCK_CONSOLE_MAX_IMPORTS', 2))
+    )
+
+
+def render_job_list():
+    """Render status of recent import jobs in sidebar"""
+    jobs = get_job_queue().list_jobs()[:5]
+    if not jobs:
+        return
+
+    with st.sidebar:
+        st.subheader("⏳ Importações")
+        for job in jobs:
+            if job.status == "completed":
+                st.success(f"{job.table_name}: {job.rows_done:,} linhas")
+            elif job.status == "failed":
+                st.error(f"{job.table_name}: {job.error}")
+            elif job.status == "running":
+                st.info(f"{job.table_name}: importando ({job.rows_done:,} linhas)")
+            else:
+                st.info(f"{job.table_name}: na fila")
+        if st.button("🔄 Atualizar status"):
+            st.rerun()
+
+
+def render_resource_panel():
+    """Render resource settings and usage in sidebar"""
+    engine = st.session_state.engine
+    with st.sidebar:
+        st.header("⚙️ Recursos")
+
+        with st.expander("Limites do servidor (compartilhados)"):
+            st.caption(
+                "Valem para todo o banco: todas as sessões e a fila de "
+                "importação usam os mesmos limites"
+            )
+            settings = engine.get_settings()
+            values = {
+                'memory_limit': st.text_input(
+                    "Limite de memória", value=settings['memory_limit']
+                ),
+                'threads': str(st.number_input(
+                    "Threads", min_value=1, value=int(settings['threads'])
+                )),
+                'temp_directory': st.text_input(
+                    "Diretório de spill", value=settings['temp_directory']
+                ),
+                'max_temp_directory_size': st.text_input(
+                    "Tamanho máximo do spill",
+                    value=settings['max_temp_directory_size']
+                ),
+            }
+            if st.button("Aplicar limites"):
+                changes = {
+                    name: value for name, value in values.items()
+                    if value != settings[name]
+                }
+                try:
+                    engine.configure(**changes)
+                    st.success("✅ Limites do servidor atualizados")
+                except Exception as e:
+                    st.error(f"❌ Erro ao aplicar limites: {str(e)}")
+
+        duck_usage = engine.get_memory_usage()
+        st.metric("Memória DuckDB", format_bytes(duck_usage['memory_bytes']))
+        st.metric("Spill em disco", format_bytes(duck_usage['temp_bytes']))
+
+        usage = get_resource_usage()
+        if usage is None:
+            st.caption("Instale psutil para monitorar CPU e memória do servidor")
+            return
+
+        col1, col2 = st.columns(2)
+        col1.metric("CPU", f"{usage.cpu_percent:.0f}%")
+        col2.metric("RAM", f"{usage.memory_percent:.0f}%")
+        st.caption(
+            f"Processo: {format_bytes(usage.process_rss)} | "
+            f"{usage.process_threads} threads"
+        )
 
 
 def render_table_list():
@@ -45,8 +163,8 @@ def handle_file_upload():
         st.header("📁 Importar Dados")
 
         uploaded_file = st.file_uploader(
-            "Escolha um arquivo CSV/TXT", 
-            type=['csv', 'txt']
+            "Escolha um arquivo CSV/TXT (aceita .gz, .zst e .zip)",
+            type=UPLOAD_TYPES
         )
 
         if uploaded_file is not None:
@@ -55,12 +173,13 @@ def handle_file_upload():
 
             if st.button("Carregar Arquivo", type="primary"):
                 try:
-                    df = read_csv(uploaded_file)
-                    info = st.session_state.engine.create_table_from_df(table_name, df)
-                    st.success(f"✅ Tabela '{table_name}' criada com sucesso!")
-                    st.info(
-                        f"📊 {info.row_count:,} linhas x {len(info.columns)} colunas"
+                    spooled = spool_upload(
+                        uploaded_file,
+                        uploaded_file.name,
+                        directory=ensure_directory('data/uploads')
                     )
+                    get_job_queue().submit(spooled, table_name, delete_source=True)
+                    st.success(f"✅ Importação da tabela '{table_name}' enfileirada!")
                 except Exception as e:
                     st.error(f"❌ Erro ao carregar arquivo: {str(e)}")
 
@@ -155,8 +274,12 @@ def main():
     st.markdown("**Console SQL interativo com DuckDB**")
     st.markdown("---")
 
+    init_metrics_server()
+    get_job_queue()  # opens the database with the server-wide limits
     init_session_state()
     handle_file_upload()
+    render_job_list()
+    render_resource_panel()
     st.markdown("---")
     render_table_list()
     render_query_editor()
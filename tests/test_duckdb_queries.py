@@ -4,7 +4,7 @@ Tests for DuckDB query functionality
 import pandas as pd
 import pytest
 
-from duck_console.core.duck_engine import DuckEngine
+from duck_console.core.duck_engine import DuckEngine, EngineConfig
 
 
 @pytest.fixture
@@ -68,4 +68,223 @@ def test_get_table_schema(engine, sample_df):
     column_names = list(schema['column_name'])
     assert 'id' in column_names
     assert 'name' in column_names
-    assert 'value' in column_names
\ No newline at end of file
+    assert 'value' in column_names
+
+
+def test_summary_refreshes_on_write(engine, sample_df):
+    """Test summary tables are rebuilt when the source is replaced"""
+    engine.create_table_from_df('test', sample_df)
+    engine.create_summary(
+        'test_totals',
+        'SELECT COUNT(*) AS n, SUM(value) AS total FROM {source}',
+        source='test'
+    )
+    assert engine.execute_query('SELECT total FROM test_totals').iloc[0]['total'] == 600
+
+    engine.create_table_from_df('test', sample_df.head(1))
+    assert engine.execute_query('SELECT total FROM test_totals').iloc[0]['total'] == 100
+
+
+def test_summary_incremental_append(engine, sample_df):
+    """Test appended rows are merged into an incremental summary"""
+    engine.create_table_from_df('test', sample_df)
+    engine.create_summary(
+        'test_by_name',
+        'SELECT name, SUM(value) AS total, MAX(id) AS last_id '
+        'FROM {source} GROUP BY name',
+        source='test',
+        key_columns=['name'],
+        merge={'total': 'sum', 'last_id': 'max'}
+    )
+
+    engine.append_df('test', pd.DataFrame({
+        'id': [4, 5],
+        'name': ['Alice', 'Dave'],
+        'value': [50, 70]
+    }))
+
+    result = engine.execute_query('SELECT * FROM test_by_name ORDER BY name')
+    assert list(result.columns) == ['name', 'total', 'last_id']
+    assert list(result['name']) == ['Alice', 'Bob', 'Charlie', 'Dave']
+    assert list(result['total']) == [150, 200, 300, 70]
+    assert result.iloc[0]['last_id'] == 4
+
+
+def test_manual_summary_marked_stale(engine, sample_df):
+    """Test manual summaries are only flagged stale on write"""
+    engine.create_table_from_df('test', sample_df)
+    summary = engine.create_summary(
+        'test_count', 'SELECT COUNT(*) AS n FROM {source}',
+        source='test', refresh='manual'
+    )
+    assert not summary.stale
+    engine.append_df('test', sample_df)
+    assert engine.summaries['test_count'].stale
+    assert engine.execute_query('SELECT n FROM test_count').iloc[0]['n'] == 3
+
+    engine.refresh_summary('test_count')
+    assert not engine.summaries['test_count'].stale
+    assert engine.execute_query('SELECT n FROM test_count').iloc[0]['n'] == 6
+
+
+def test_summary_rejects_unmerged_columns(engine, sample_df):
+    """Test incremental summaries must cover every column"""
+    engine.create_table_from_df('test', sample_df)
+    with pytest.raises(ValueError, match='last_id'):
+        engine.create_summary(
+            'test_by_name',
+            'SELECT name, SUM(value) AS total, MAX(id) AS last_id '
+            'FROM {source} GROUP BY name',
+            source='test',
+            key_columns=['name'],
+            merge={'total': 'sum'}
+        )
+    assert 'test_by_name' not in engine.summaries
+    assert 'test_by_name' not in engine.get_table_names()
+
+
+def test_summary_requires_source(engine):
+    """Test summaries cannot be declared before their source table"""
+    with pytest.raises(KeyError):
+        engine.create_summary(
+            'test_totals', 'SELECT SUM(value) AS total FROM {source}', source='test'
+        )
+    assert 'test_totals' not in engine.summaries
+
+
+def test_failed_summary_refresh_keeps_write(engine, sample_df):
+    """Test a summary that cannot be rebuilt is marked stale, not the write"""
+    engine.create_table_from_df('test', sample_df)
+    engine.create_summary(
+        'test_totals', 'SELECT SUM(value) AS total FROM {source}', source='test'
+    )
+
+    engine.create_table_from_df('test', sample_df[['id', 'name']])
+    assert engine.get_table_info('test').columns == ['id', 'name']
+    assert engine.summaries['test_totals'].stale
+
+    engine.create_table_from_df('test', sample_df)
+    assert not engine.summaries['test_totals'].stale
+
+
+def test_append_matches_columns_by_name(engine, sample_df):
+    """Test appended DataFrames may list columns in any order"""
+    engine.create_table_from_df('test', sample_df)
+    engine.append_df('test', pd.DataFrame({
+        'value': [400],
+        'name': ['Dave'],
+        'id': [4]
+    }))
+    result = engine.execute_query('SELECT name, value FROM test WHERE id = 4')
+    assert result.iloc[0]['name'] == 'Dave'
+    assert result.iloc[0]['value'] == 400
+
+
+def test_summary_query_with_braces(engine, sample_df):
+    """Test braces other than {source} are kept in the summary SQL"""
+    engine.create_table_from_df('test', sample_df)
+    engine.create_summary(
+        'test_struct',
+        "SELECT {'total': SUM(value)} AS s FROM {source}",
+        source='test'
+    )
+    result = engine.execute_query('SELECT s.total AS total FROM test_struct')
+    assert result.iloc[0]['total'] == 600
+
+
+def test_summary_definitions_persist(tmp_path, sample_df):
+    """Test summaries survive reopening the database"""
+    database = tmp_path / 'summaries.duckdb'
+    engine = DuckEngine(database)
+    engine.create_table_from_df('test', sample_df)
+    engine.create_summary(
+        'test_totals', 'SELECT SUM(value) AS total FROM {source}', source='test'
+    )
+    engine.close()
+
+    engine = DuckEngine(database)
+    assert 'test_totals' in engine.summaries
+    engine.append_df('test', sample_df)
+    result = engine.execute_query('SELECT total FROM test_totals')
+    assert result.iloc[0]['total'] == 1200
+    assert 'test_totals' in engine.get_table_names()
+    engine.close()
+
+
+def test_engine_config():
+    """Test resource limits are applied to the connection"""
+    config = EngineConfig(memory_limit='512MB', threads=2)
+    engine = DuckEngine(config=config)
+
+    settings = engine.get_settings()
+    assert settings['threads'] == '2'
+    assert 'MiB' in settings['memory_limit']
+
+    engine.configure(threads=1)
+    assert engine.get_settings()['threads'] == '1'
+    assert engine.config.threads == 1
+
+    with pytest.raises(ValueError):
+        engine.configure(bogus=1)
+
+
+def test_engine_config_is_instance_wide(tmp_path):
+    """Test engines on one database file share and report the same limits"""
+    database = tmp_path / 'shared.duckdb'
+    first = DuckEngine(database, config=EngineConfig(threads=2))
+    second = DuckEngine(database, config=EngineConfig(threads=1))
+    assert first.config.threads == 1
+    assert second.config.threads == 1
+
+    first.configure(threads=2)
+    assert second.config.threads == 2
+    second.close()
+    first.close()
+
+
+def test_engine_config_from_env(monkeypatch):
+    """Test reading resource limits from environment variables"""
+    monkeypatch.setenv('DUCK_CONSOLE_THREADS', '3')
+    monkeypatch.setenv('DUCK_CONSOLE_MEMORY_LIMIT', '1GB')
+
+    config = EngineConfig.from_env()
+    assert config.to_duckdb() == {'memory_limit': '1GB', 'threads': 3}
+
+
+def test_execute_with_params(engine, sample_df):
+    """Test parameterized queries reuse cached statements"""
+    engine.create_table_from_df('test', sample_df)
+    query = 'SELECT name FROM test WHERE value > ? ORDER BY id'
+
+    assert list(engine.execute(query, [150])['name']) == ['Bob', 'Charlie']
+    assert list(engine.execute(query, [250])['name']) == ['Charlie']
+
+    info = engine.statement_cache_info()
+    assert info.hits >= 1
+    assert info.misses >= 1
+
+    # Values are bound, never spliced into the SQL text
+    result = engine.execute(
+        'SELECT name FROM test WHERE name = $name',
+        {'name': "x' OR '1'='1"}
+    )
+    assert result.empty
+
+
+def test_executemany_bulk_insert(engine):
+    """Test bulk inserting rows with executemany"""
+    engine.execute('CREATE TABLE items (id INTEGER, label VARCHAR)')
+    count = engine.executemany(
+        'INSERT INTO items VALUES (?, ?)',
+        [(1, 'a'), (2, 'b'), (3, 'c')]
+    )
+    assert count == 3
+    assert engine.get_table_info('items').row_count == 3
+
+
+def test_statement_cache_eviction():
+    """Test the statement cache is bounded"""
+    engine = DuckEngine(statement_cache_size=2)
+    for i in range(5):
+        engine.execute(f'SELECT {i} AS n')
+    assert engine.statement_cache_info().size == 2
@@ -1,12 +1,14 @@
 """
 Tests for file import functionality
 """
+import gzip
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
 import pandas as pd
 import pytest
 
+from duck_console.core.file_reader import read_csv, sniff_file
 from duck_console.core.layout_importer import FieldDefinition, LayoutDefinition, LayoutImporter
 
 
@@ -61,4 +63,89 @@ def test_invalid_layout():
     """Test error handling for invalid layout name"""
     importer = LayoutImporter()
     with pytest.raises(KeyError):
-        importer.import_file("dummy.txt", "nonexistent_layout")
\ No newline at end of file
+        importer.import_file("dummy.txt", "nonexistent_layout")
+
+
+def test_sniff_latin1_csv(tmp_path):
+    """Test detecting encoding and delimiter of a latin-1 CSV"""
+    path = tmp_path / "clientes.csv"
+    text = "nome;cidade;valor\r\nJoão;São Paulo;10\r\nAndré;Brasília;20\r\n"
+    path.write_bytes(text.encode("latin-1"))
+
+    dialect = sniff_file(path)
+    assert dialect.encoding != "utf-8"
+    assert dialect.delimiter == ";"
+    assert dialect.line_terminator == "\r\n"
+    assert sniff_file(path) is dialect  # cached by fingerprint
+
+    df = read_csv(path)
+    assert list(df.columns) == ["nome", "cidade", "valor"]
+    assert df.iloc[0]["cidade"] == "São Paulo"
+
+
+def test_read_csv_explicit_options(tmp_path):
+    """Test pandas options given by the caller are passed through unchanged"""
+    path = tmp_path / "vendas.csv"
+    path.write_text("id;valor\n1;10\n2;20\n")
+    assert list(read_csv(path, delimiter=";").columns) == ["id", "valor"]
+    assert list(read_csv(path, sep=",").columns) == ["id;valor"]
+
+    compressed = tmp_path / "vendas.csv.gz"
+    compressed.write_bytes(gzip.compress(path.read_bytes()))
+    df = read_csv(str(compressed), compression="gzip", sep=";")
+    assert list(df["valor"]) == [10, 20]
+
+
+def test_layout_detects_encoding(sample_layout, tmp_path):
+    """Test layouts without an encoding use the detected one"""
+    path = tmp_path / "records.txt"
+    path.write_bytes("00001José      123.45\n00002Inês      234.56\n".encode("latin-1"))
+
+    assert sniff_file(path).record_length == 21
+
+    importer = LayoutImporter()
+    importer.register_layout("test", sample_layout)
+    df = importer.import_file(path, "test")
+    assert df.iloc[0]["name"].strip() == "José"
+
+
+def test_layout_longer_than_records(sample_layout, tmp_path):
+    """Test a layout with fields past the record end fails before parsing"""
+    path = tmp_path / "short.txt"
+    path.write_text("00001John\n00002Anna\n")
+
+    importer = LayoutImporter()
+    importer.register_layout("test", sample_layout)
+    with pytest.raises(ValueError):
+        importer.import_file(path, "test")
+
+
+def test_sniff_samples_tail(tmp_path):
+    """Test non-ASCII text near the end of a large file is detected"""
+    path = tmp_path / "cidades.csv"
+    rows = "".join(f"{i};Sao Paulo\n" for i in range(30_000))
+    path.write_bytes(f"id;cidade\n{rows}30000;Brasília\n".encode("latin-1"))
+
+    assert sniff_file(path).encoding not in ("ascii", "utf-8")
+
+
+def test_ascii_sample_is_not_utf8(tmp_path):
+    """Test a file with only ASCII in its sampled blocks reads later Latin-1"""
+    path = tmp_path / "cidades.csv"
+    head = "".join(f"{i};Sao Paulo\n" for i in range(10_000))
+    tail = "".join(f"{i};Sao Paulo\n" for i in range(10_001, 40_000))
+    path.write_bytes(f"id;cidade\n{head}10000;São Paulo\n{tail}".encode("latin-1"))
+
+    assert sniff_file(path).encoding == "ascii"
+    df = read_csv(path)
+    assert df[df["id"] == 10_000].iloc[0]["cidade"] == "São Paulo"
+
+
+def test_sniff_cache_by_content(tmp_path):
+    """Test copies of a file under another path reuse the cached dialect"""
+    original = tmp_path / "vendas.csv"
+    original.write_text("id,valor\n1,10\n2,20\n")
+    copy = tmp_path / "upload_123.csv"
+    copy.write_bytes(original.read_bytes())
+
+    assert sniff_file(copy) is sniff_file(original)
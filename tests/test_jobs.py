@@ -0,0 +1,149 @@
+"""
+Tests for the ingestion job queue
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from duck_console.core.duck_engine import DuckEngine
+from duck_console.core.jobs import (
+    JobQueue,
+    cancel_job,
+    enqueue_job,
+    load_jobs,
+    read_job,
+)
+
+
+def _wait(queue, job_id, timeout=10):
+    """Poll a job until it leaves the queued/running states"""
+    deadline = time.time() + timeout
+    job = queue.get(job_id)
+    while job.status in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.05)
+        job = queue.get(job_id)
+    return job
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Fixture providing a job queue over an in-memory engine"""
+    queue = JobQueue(DuckEngine(), tmp_path / "jobs", max_workers=2)
+    yield queue
+    queue.shutdown()
+
+
+def test_job_completes(queue, tmp_path):
+    """Test a queued CSV import runs in the background"""
+    source = tmp_path / "people.csv"
+    source.write_text("id,name\n1,Alice\n2,Bob\n")
+
+    job = _wait(queue, queue.submit(source, "people", delete_source=True).id)
+    assert job.status == "completed"
+    assert job.rows_done == 2
+    assert job.bytes_done == job.bytes_total
+    assert not source.exists()
+    assert queue.engine.get_table_info("people").row_count == 2
+
+    persisted = load_jobs(tmp_path / "jobs")
+    assert [j.status for j in persisted] == ["completed"]
+
+
+def test_job_failure_is_reported(queue, tmp_path):
+    """Test a failing import ends with status failed and an error"""
+    source = tmp_path / "records.txt"
+    source.write_text("00001abc\n")
+
+    job = _wait(queue, queue.submit(source, "records", layout_name="missing").id)
+    assert job.status == "failed"
+    assert "missing" in job.error
+
+
+def _write_job(state_dir, job_id, source, **fields):
+    """Persist a job as another process would have left it"""
+    state_dir.mkdir(exist_ok=True)
+    extra = "".join(f', "{name}": {value}' for name, value in fields.items())
+    (state_dir / f"{job_id}.json").write_text(
+        '{"id": "%s", "table_name": "people", "file_path": "%s", '
+        '"status": "running", "created_at": "2024-01-01T00:00:00"%s}'
+        % (job_id, source, extra)
+    )
+
+
+def test_orphaned_jobs_resume(tmp_path):
+    """Test only jobs whose owner process is gone are picked up"""
+    source = tmp_path / "people.csv"
+    source.write_text("id\n1\n")
+    dead = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True, text=True, check=True
+    )
+    host = f'"{socket.gethostname()}"'
+
+    state = tmp_path / "jobs"
+    _write_job(state, "orphan", source, owner_pid=int(dead.stdout), owner_host=host)
+    _write_job(state, "owned", source, owner_pid=os.getpid(), owner_host=host)
+
+    queue = JobQueue(DuckEngine(), state, max_workers=1)
+    try:
+        assert _wait(queue, "orphan").status == "completed"
+        assert queue.get("owned").status == "running"
+    finally:
+        queue.shutdown()
+
+
+def test_queues_share_state_directory(tmp_path):
+    """Test two queues on one directory keep each other's jobs"""
+    first_source = tmp_path / "first.csv"
+    first_source.write_text("id\n1\n")
+    second_source = tmp_path / "second.csv"
+    second_source.write_text("id\n1\n2\n")
+
+    first = JobQueue(DuckEngine(), tmp_path / "jobs", adopt=False)
+    second = JobQueue(DuckEngine(), tmp_path / "jobs", adopt=False)
+    try:
+        first_job = _wait(first, first.submit(first_source, "first").id)
+        second_job = _wait(second, second.submit(second_source, "second").id)
+    finally:
+        first.shutdown()
+        second.shutdown()
+
+    persisted = {job.id: job for job in load_jobs(tmp_path / "jobs")}
+    assert persisted[first_job.id].rows_done == 1
+    assert persisted[second_job.id].rows_done == 2
+
+
+def test_enqueued_job_is_adopted(tmp_path):
+    """Test jobs queued by another process are run by a watching queue"""
+    source = tmp_path / "people.csv"
+    source.write_text("id\n1\n")
+
+    queue = JobQueue(DuckEngine(), tmp_path / "jobs", poll_interval=0.05)
+    try:
+        job = enqueue_job(tmp_path / "jobs", source, "people")
+        assert _wait(queue, job.id).status == "completed"
+        assert queue.get(job.id).owner_pid == os.getpid()
+    finally:
+        queue.shutdown()
+
+
+def test_cancel_unadopted_job(tmp_path):
+    """Test an enqueued job can be withdrawn until a queue adopts it"""
+    source = tmp_path / "people.csv"
+    source.write_text("id\n1\n")
+
+    job = enqueue_job(tmp_path / "jobs", source, "people")
+    assert cancel_job(tmp_path / "jobs", job.id)
+    with pytest.raises(KeyError):
+        read_job(tmp_path / "jobs", job.id)
+
+    queue = JobQueue(DuckEngine(), tmp_path / "jobs")
+    try:
+        job = queue.submit(source, "people")
+        assert not cancel_job(tmp_path / "jobs", job.id)
+    finally:
+        queue.shutdown()
@@ -0,0 +1,62 @@
+"""
+Tests for metrics and tracing
+"""
+import pandas as pd
+import pytest
+
+from duck_console.core.duck_engine import DuckEngine
+from duck_console.utils.metrics import MetricsRegistry, metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Fixture resetting the global registry around each test"""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_prometheus_export():
+    """Test counters, gauges and spans in the text format"""
+    registry = MetricsRegistry()
+    registry.inc("rows_total", 5, phase="load")
+    registry.add_gauge("active_sessions", 2)
+    with registry.span("phase", phase="query"):
+        pass
+
+    text = registry.render_prometheus()
+    assert "# TYPE duck_console_rows_total counter" in text
+    assert 'duck_console_rows_total{phase="load"} 5' in text
+    assert "duck_console_active_sessions 2" in text
+    assert 'duck_console_phase_seconds_count{phase="query"} 1' in text
+
+
+def test_hooks_receive_events():
+    """Test hooks see every observation and failures are isolated"""
+    registry = MetricsRegistry()
+    events = []
+    registry.add_hook(lambda event: 1 / 0)
+    registry.add_hook(events.append)
+
+    registry.inc("queries_total")
+    with registry.span("phase", phase="parse"):
+        pass
+
+    assert [(e.kind, e.name) for e in events] == [
+        ("counter", "queries_total"),
+        ("span", "phase"),
+    ]
+    assert events[1].labels == {"phase": "parse"}
+
+
+def test_engine_instrumentation():
+    """Test engine loads and queries are counted"""
+    engine = DuckEngine()
+    engine.create_table_from_df("test", pd.DataFrame({"id": [1, 2, 3]}))
+    engine.execute("SELECT * FROM test WHERE id > ?", [1])
+    engine.execute("SELECT * FROM test WHERE id > ?", [2])
+
+    assert metrics.get("rows_total", phase="load") == 3
+    assert metrics.get("rows_total", phase="query") == 3
+    assert metrics.get("queries_total") == 2
+    assert metrics.get("statement_cache_hits_total") == 1
@@ -0,0 +1,74 @@
+"""
+Tests for partitioned tables
+"""
+import duckdb
+import pandas as pd
+import pytest
+
+from duck_console.core.duck_engine import DuckEngine
+
+
+@pytest.fixture
+def sales(tmp_path):
+    """Fixture providing a partitioned sales table with two months"""
+    engine = DuckEngine()
+    partitions = engine.add_partitioned_table(
+        'sales', tmp_path / 'sales', max_workers=2
+    )
+    partitions.ingest_many({
+        '2024_01': pd.DataFrame({'store': ['a', 'b'], 'amount': [10, 20]}),
+        '2024_02': pd.DataFrame({'store': ['a', 'a'], 'amount': [5, 7]}),
+    })
+    return engine
+
+
+def test_fan_out_with_merge(sales):
+    """Test partial aggregates are re-aggregated across partitions"""
+    result = sales.query_partitioned(
+        'sales',
+        'SELECT store, SUM(amount) AS total FROM sales GROUP BY store',
+        merge_query='SELECT store, SUM(total) AS total FROM partials '
+                    'GROUP BY store ORDER BY store'
+    )
+    assert list(result['store']) == ['a', 'b']
+    assert list(result['total']) == [22, 20]
+
+
+def test_append_and_detach(sales, tmp_path):
+    """Test appending to a partition and detaching another"""
+    partitions = sales.partitions['sales']
+    rows = pd.DataFrame({'store': ['b'], 'amount': [1]})
+    assert partitions.ingest('2024_02', rows) == 3
+
+    partitions.detach('2024_01', delete=True)
+    assert not (tmp_path / 'sales' / '2024_01.duckdb').exists()
+
+    result = partitions.query('SELECT COUNT(*) AS n FROM sales')
+    assert result['n'].sum() == 3
+
+    with pytest.raises(KeyError):
+        partitions.query('SELECT * FROM sales', keys=['2024_01'])
+
+
+def test_worker_pool_reused(sales):
+    """Test queries share one worker pool until the set is closed"""
+    partitions = sales.partitions['sales']
+    partitions.query('SELECT COUNT(*) AS n FROM sales')
+    pool = partitions._executor
+    partitions.query('SELECT COUNT(*) AS n FROM sales')
+    assert partitions._executor is pool
+
+    sales.close()
+    assert partitions._executor is None
+
+
+def test_query_while_partition_open_for_writing(sales, tmp_path):
+    """Test fan-out queries work while a partition is being written"""
+    partitions = sales.partitions['sales']
+    writer = duckdb.connect(str(partitions.path_for('2024_01')))
+    try:
+        writer.execute("INSERT INTO sales VALUES ('c', 1)")
+        result = partitions.query('SELECT COUNT(*) AS n FROM sales')
+        assert result['n'].sum() == 5
+    finally:
+        writer.close()
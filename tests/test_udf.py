@@ -0,0 +1,128 @@
+"""
+Tests for Python UDF registration
+"""
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from duck_console.core.duck_engine import DuckEngine
+
+pc = pytest.importorskip("pyarrow.compute")
+
+PLUGIN = '''
+import pyarrow.compute as pc
+
+from duck_console.core.udf import udf
+
+
+@udf(["VARCHAR"], "VARCHAR", name="normalize")
+def normalize_code(values):
+    return pc.utf8_upper(pc.utf8_trim_whitespace(values))
+
+
+def helper(value):
+    return value
+'''
+
+
+@pytest.fixture
+def engine():
+    """Fixture providing an engine with a sample table"""
+    engine = DuckEngine()
+    engine.create_table_from_df("codes", pd.DataFrame({
+        "code": [" ab1 ", "cd2", "ef3 "],
+        "value": [1, 2, 3]
+    }))
+    return engine
+
+
+def test_arrow_function(engine):
+    """Test an Arrow-vectorized function runs inside a query"""
+    engine.register_function(
+        "clean", lambda v: pc.utf8_trim_whitespace(v), ["VARCHAR"], "VARCHAR"
+    )
+    result = engine.execute_query(
+        "SELECT clean(code) AS code FROM codes ORDER BY value"
+    )
+    assert list(result["code"]) == ["ab1", "cd2", "ef3"]
+
+
+def test_numpy_function(engine):
+    """Test a NumPy-vectorized function"""
+    engine.register_function(
+        "times_ten", lambda v: v * 10, ["BIGINT"], "BIGINT", batch_format="numpy"
+    )
+    result = engine.execute_query("SELECT SUM(times_ten(value)) AS total FROM codes")
+    assert result.iloc[0]["total"] == 60
+
+
+def test_row_function_and_replace(engine):
+    """Test per-row functions and re-registering a name"""
+    engine.register_function(
+        "is_big", lambda v: v % 2 == 0, ["BIGINT"], "BOOLEAN", vectorized=False
+    )
+    engine.register_function(
+        "is_big", lambda v: v > 2, ["BIGINT"], "BOOLEAN", vectorized=False
+    )
+    result = engine.execute_query("SELECT value FROM codes WHERE is_big(value)")
+    assert list(result["value"]) == [3]
+
+
+def test_load_plugins(tmp_path):
+    """Test functions are loaded from a plugin directory at startup"""
+    (tmp_path / "codes.py").write_text(PLUGIN)
+    engine = DuckEngine(plugin_directory=tmp_path)
+
+    assert list(engine.functions) == ["normalize"]
+    result = engine.execute_query("SELECT normalize(' ab1 ') AS code")
+    assert result.iloc[0]["code"] == "AB1"
+
+
+def test_plugins_on_shared_database(tmp_path):
+    """Test several engines on one database file can load the same plugins"""
+    plugins = tmp_path / "plugins"
+    plugins.mkdir()
+    (plugins / "codes.py").write_text(PLUGIN)
+    database = tmp_path / "console.duckdb"
+
+    first = DuckEngine(database, plugin_directory=plugins)
+    second = DuckEngine(database, plugin_directory=plugins)
+    assert list(second.functions) == ["normalize"]
+
+    first.close()
+    result = second.execute_query("SELECT normalize(' ab1 ') AS code")
+    assert result.iloc[0]["code"] == "AB1"
+    second.close()
+
+
+def test_register_replaces_function_of_other_engine(tmp_path):
+    """Test a changed definition replaces the function for every engine"""
+    database = tmp_path / "console.duckdb"
+    first = DuckEngine(database)
+    second = DuckEngine(database)
+    first.register_function("f", lambda v: v, ["BIGINT"], "BIGINT", vectorized=False)
+    second.register_function(
+        "f", lambda v: v * 100, ["BIGINT"], "BIGINT", vectorized=False
+    )
+
+    assert second.execute_query("SELECT f(2) AS v").iloc[0]["v"] == 200
+    assert first.execute_query("SELECT f(2) AS v").iloc[0]["v"] == 200
+    first.close()
+    second.close()
+
+
+def test_database_released_after_last_close(tmp_path):
+    """Test closing every engine on a file releases it for other processes"""
+    database = tmp_path / "console.duckdb"
+    first = DuckEngine(database)
+    second = DuckEngine(database)
+    first.register_function("f", lambda v: v, ["BIGINT"], "BIGINT", vectorized=False)
+    first.close()
+    second.close()
+
+    subprocess.run(
+        [sys.executable, "-c", f"import duckdb; duckdb.connect({str(database)!r})"],
+        check=True
+    )
@@ -0,0 +1,207 @@
+"""
+Tests for the upload pipeline
+"""
+import gzip
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+from duck_console.core import file_reader, upload
+from duck_console.core.duck_engine import DuckEngine
+from duck_console.core.layout_importer import (
+    FieldDefinition,
+    LayoutDefinition,
+    LayoutImporter,
+)
+from duck_console.core.upload import load_file, spool_upload
+from duck_console.utils.io_helpers import sanitize_table_name
+
+CSV_DATA = b"id,name\n1,Alice\n2,Bob\n3,Charlie\n"
+
+
+def load_upload(engine, source, filename, table_name, **kwargs):
+    """Spool an upload the way the web console does and load it"""
+    spooled = spool_upload(source, filename)
+    try:
+        return load_file(engine, spooled, table_name, **kwargs)
+    finally:
+        spooled.unlink()
+
+
+def _zip(data: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("data.csv", data)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("filename,payload", [
+    ("data.csv", CSV_DATA),
+    ("data.csv.gz", gzip.compress(CSV_DATA)),
+    ("data.zip", _zip(CSV_DATA)),
+])
+def test_load_csv_upload(filename, payload):
+    """Test loading plain and compressed CSV uploads"""
+    engine = DuckEngine()
+    info = load_upload(engine, io.BytesIO(payload), filename, "people")
+
+    assert info.row_count == 3
+    assert info.columns == ["id", "name"]
+    result = engine.execute_query("SELECT name FROM people ORDER BY id")
+    assert list(result["name"]) == ["Alice", "Bob", "Charlie"]
+
+
+def test_load_zstd_upload():
+    """Test loading a zstd-compressed CSV upload"""
+    zstandard = pytest.importorskip("zstandard")
+    engine = DuckEngine()
+    payload = zstandard.ZstdCompressor().compress(CSV_DATA)
+    info = load_upload(engine, io.BytesIO(payload), "data.csv.zst", "people")
+    assert info.row_count == 3
+
+
+def test_load_layout_upload_in_chunks():
+    """Test streaming a compressed fixed-width upload through a layout"""
+    importer = LayoutImporter()
+    importer.register_layout("test", LayoutDefinition(fields=[
+        FieldDefinition(name="id", start=0, length=5, dtype="int"),
+        FieldDefinition(name="name", start=5, length=10),
+    ]))
+    lines = "".join(f"{i:05d}{'name' + str(i):<10}\n" for i in range(25))
+
+    engine = DuckEngine()
+    info = load_upload(
+        engine, io.BytesIO(gzip.compress(lines.encode())), "records.txt.gz",
+        "records", importer=importer, layout_name="test"
+    )
+    assert info.row_count == 25
+
+
+def test_chunked_import_refreshes_summaries_once(tmp_path, monkeypatch):
+    """Test summaries are refreshed after the last chunk, not per chunk"""
+    importer = LayoutImporter()
+    importer.register_layout("test", LayoutDefinition(fields=[
+        FieldDefinition(name="id", start=0, length=5, dtype="int"),
+    ]))
+    path = tmp_path / "records.txt"
+    path.write_text("".join(f"{i:05d}\n" for i in range(25)))
+
+    engine = DuckEngine()
+    engine.create_table_from_df("records", pd.DataFrame({"id": [1]}))
+    engine.create_summary(
+        "records_count", "SELECT COUNT(*) AS n FROM {source}", "records"
+    )
+    refreshes = []
+    refresh_dependents = engine.refresh_dependents
+
+    def spy(*args, **kwargs):
+        refreshes.append(args)
+        refresh_dependents(*args, **kwargs)
+
+    monkeypatch.setattr(engine, "refresh_dependents", spy)
+    load_file(
+        engine, path, "records", importer=importer, layout_name="test", chunksize=10
+    )
+    assert len(refreshes) == 1
+    assert engine.execute_query("SELECT n FROM records_count").iloc[0]["n"] == 25
+
+
+def test_failed_csv_import_keeps_table(tmp_path):
+    """Test a failed CSV load leaves the existing table in place"""
+    engine = DuckEngine()
+    path = tmp_path / "people.csv"
+    path.write_bytes(CSV_DATA)
+    engine.create_table_from_csv("people", path)
+
+    with pytest.raises(Exception):
+        engine.create_table_from_csv("people", tmp_path / "missing.csv")
+    assert engine.get_table_info("people").row_count == 3
+
+
+def test_failed_chunked_import_keeps_table(tmp_path):
+    """Test a chunk failing mid-import leaves the existing table in place"""
+    importer = LayoutImporter()
+    importer.register_layout("test", LayoutDefinition(fields=[
+        FieldDefinition(name="id", start=0, length=5, dtype="int"),
+    ]))
+    engine = DuckEngine()
+    engine.create_table_from_df("records", pd.DataFrame({"id": range(6)}))
+
+    path = tmp_path / "records.txt"
+    path.write_text("00001\n00002\nabcde\n")
+    with pytest.raises(Exception):
+        load_file(
+            engine, path, "records", importer=importer, layout_name="test",
+            chunksize=2
+        )
+    assert engine.get_table_info("records").row_count == 6
+
+
+def test_sanitize_compressed_name():
+    """Test compression suffixes are dropped from table names"""
+    assert sanitize_table_name("Vendas 2024.csv.gz") == "vendas_2024"
+
+
+def test_load_latin1_upload():
+    """Test non-UTF-8 uploads are transcoded before DuckDB reads them"""
+    payload = "id;cidade\n1;São Paulo\n2;Brasília\n".encode("latin-1")
+    engine = DuckEngine()
+    load_upload(engine, io.BytesIO(gzip.compress(payload)), "cidades.csv.gz", "cidades")
+
+    result = engine.execute_query("SELECT cidade FROM cidades ORDER BY id")
+    assert list(result["cidade"]) == ["São Paulo", "Brasília"]
+
+
+def test_csv_progress_while_loading(tmp_path, monkeypatch):
+    """Test rows and bytes are reported during a CSV load, not only at the end"""
+    monkeypatch.setattr(upload, "PIPE_CHUNK_SIZE", 1024)
+    monkeypatch.setattr(file_reader, "TRANSCODE_CHUNK_SIZE", 1024)
+    monkeypatch.setattr(upload, "PROGRESS_INTERVAL", 0)
+    lines = "".join(f"{i},name{i}\n" for i in range(5000))
+    path = tmp_path / "people.csv.gz"
+    path.write_bytes(gzip.compress(f"id,name\n{lines}".encode()))
+
+    reports = []
+    engine = DuckEngine()
+    info = load_file(
+        engine, path, "people", progress=lambda rows, done: reports.append((rows, done))
+    )
+
+    assert info.row_count == 5000
+    assert len(reports) > 2
+    assert 0 < reports[0][0] < 5000
+    assert 0 < reports[0][1] < path.stat().st_size
+    assert reports[-1] == (5000, path.stat().st_size)
+
+
+def test_failed_piped_import_rolls_back(tmp_path):
+    """Test a truncated archive does not leave a partial table behind"""
+    engine = DuckEngine()
+    path = tmp_path / "people.csv"
+    path.write_bytes(CSV_DATA)
+    engine.create_table_from_csv("people", path)
+
+    payload = gzip.compress(b"id,name\n" + b"4,Dave\n" * 10000)
+    broken = tmp_path / "people.csv.gz"
+    broken.write_bytes(payload[: len(payload) // 2])
+
+    with pytest.raises(EOFError):
+        load_file(engine, broken, "people", progress=lambda rows, done: None)
+    assert engine.get_table_info("people").row_count == 3
+
+
+@pytest.mark.parametrize("progress", [None, lambda rows, done: None])
+def test_load_late_latin1_csv(tmp_path, progress):
+    """Test Latin-1 rows outside the sampled blocks are transcoded"""
+    head = "".join(f"{i};Sao Paulo\n" for i in range(10_000))
+    tail = "".join(f"{i};Sao Paulo\n" for i in range(10_001, 40_000))
+    path = tmp_path / "cidades.csv"
+    path.write_bytes(f"id;cidade\n{head}10000;São Paulo\n{tail}".encode("latin-1"))
+
+    engine = DuckEngine()
+    info = load_file(engine, path, "cidades", progress=progress)
+    assert info.row_count == 40_000
+    result = engine.execute_query("SELECT cidade FROM cidades WHERE id = 10000")
+    assert result.iloc[0]["cidade"] == "São Paulo"